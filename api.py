@@ -5,79 +5,157 @@ Provides all the data digized needs to see my status without asking
 """
 
 import json
-import subprocess
-import os
-import glob
+import importlib.util
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime, timedelta
 from pathlib import Path
-import psutil
+
+import apicodec
+import config
+import eventlog
+import history
+import metrics
+import nodeprobe
+import pacing
+import sysmetrics
+from procscan import scanner
+from tailreader import daily_log, memory_index
+import watcher
+
+def workspace_path():
+    """OpenClaw workspace the collectors read from"""
+    return Path(config.get("workspace"))
+
+# How expensive a collector is to run: the floor on its refresh interval, and how many
+# times its last run time the scheduler waits before running it again
+COST_CLASSES = {
+    "cheap": {"min_interval": 1, "stretch": 10},        # in-memory or a few /proc reads
+    "io": {"min_interval": 5, "stretch": 20},           # walks files or the process table
+    "subprocess": {"min_interval": 30, "stretch": 50}   # forks a command
+}
+
+class Collector:
+    """A registered status section and how to schedule it"""
+
+    def __init__(self, name, func, interval, cost, depends, schema, timeout):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Collector {name!r}: unknown cost class {cost!r}")
+        for dependency in depends:
+            # Dependencies must already be registered, which also rules out cycles
+            if dependency not in COLLECTORS:
+                raise ValueError(f"Collector {name!r} depends on unregistered {dependency!r}")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cost = cost
+        self.depends = tuple(depends)
+        self.schema = schema
+        self.timeout = timeout
+
+    def __call__(self, inputs=None):
+        return self.func(inputs) if self.depends else self.func()
+
+    def next_interval(self, duration_ms, interval=None):
+        """Seconds until the next run - never below the cost floor, and longer after slow runs"""
+        cost = COST_CLASSES[self.cost]
+        interval = self.interval if interval is None else interval
+        return max(interval, cost["min_interval"], duration_ms / 1000 * cost["stretch"])
+
+    def describe(self):
+        return {"interval": self.interval, "cost": self.cost, "depends": list(self.depends),
+                "timeout": self.timeout}
+
+# Section name -> Collector, in payload order (built-ins first, then plugins)
+COLLECTORS = {}
+
+def collector(name, interval=60, cost="cheap", depends=(), schema=None, timeout=None):
+    """Register the decorated function as the collector for a status section
+    
+    A collector with depends is called with {dependency: latest value}; schema describes
+    its output (see check_schema) and mismatches are reported in the collector timings.
+    """
+    def register(func):
+        if name in COLLECTORS:
+            raise ValueError(f"Collector {name!r} is already registered")
+        COLLECTORS[name] = Collector(name, func, interval, cost, depends, schema, timeout)
+        return func
+    return register
+
+def check_schema(value, schema, path="$"):
+    """Problems with value against schema: a type or tuple of types (None allowed), a [schema]
+    for lists of items, or a {key: schema} dict of required keys"""
+    if schema is None:
+        return []
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{path}: expected list, got {type(value).__name__}"]
+        return [problem for i, item in enumerate(value) for problem in check_schema(item, schema[0], f"{path}[{i}]")]
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return [f"{path}: expected object, got {type(value).__name__}"]
+        problems = []
+        for key, item_schema in schema.items():
+            if key not in value:
+                problems.append(f"{path}.{key}: missing")
+            else:
+                problems += check_schema(value[key], item_schema, f"{path}.{key}")
+        return problems
+    types = tuple(type(None) if t is None else t for t in (schema if isinstance(schema, tuple) else (schema,)))
+    if not isinstance(value, types):
+        return [f"{path}: expected {' or '.join(t.__name__ for t in types)}, got {type(value).__name__}"]
+    return []
 
 def get_comprehensive_status():
     """Get complete Digiclaw status - everything digized needs to know"""
     
-    workspace = Path("/home/digized/.openclaw/workspace")
+    workspace = workspace_path()
     
-    status = {
-        "timestamp": datetime.now().isoformat(),
-        "system": get_system_metrics(),
-        "memory_summary": get_memory_summary(),
-        "current_activity": get_current_activity(), 
-        "projects": get_active_projects(),
-        "cron_status": get_cron_status(),
-        "nodes": get_node_status(),
-        "recent_conversations": get_recent_conversations(),
-        "autonomous_work": get_autonomous_work(),
-        "next_actions": get_next_actions(),
-        "performance": get_performance_metrics()
-    }
+    status = {"timestamp": datetime.now().isoformat()}
+    results, timings = run_collectors()
+    status.update(results)
+    status["collectors"] = timings
     
     return status
 
+@collector("system", interval=5, cost="cheap", timeout=3.0,
+           schema={"memory": dict, "cpu": dict, "load": dict, "uptime_seconds": (int, float), "disks": [dict]})
 def get_system_metrics():
     """Real-time system performance"""
     try:
-        # Memory
-        with open('/proc/meminfo', 'r') as f:
-            meminfo = f.read()
-        
-        mem_total = mem_available = 0
-        for line in meminfo.split('\n'):
-            if line.startswith('MemTotal:'):
-                mem_total = int(line.split()[1]) // 1024
-            elif line.startswith('MemAvailable:'):
-                mem_available = int(line.split()[1]) // 1024
+        metrics = sysmetrics.collect(config.get("mount_points") or ["/"])
+        memory = metrics["memory"]
+        root_disk = next((disk for disk in metrics["disks"] if "error" not in disk), None)
         
-        # Disk
-        disk = subprocess.run(['df', '-h', '/'], capture_output=True, text=True)
-        disk_parts = disk.stdout.split('\n')[1].split()
-        
-        # CPU
-        cpu_usage = psutil.cpu_percent(interval=1)
-        
-        # Uptime
-        with open('/proc/uptime', 'r') as f:
-            uptime_seconds = float(f.read().split()[0])
-        
-        uptime_str = str(timedelta(seconds=int(uptime_seconds)))
-        
-        return {
-            "memory_total": f"{mem_total}MB",
-            "memory_available": f"{mem_available}MB", 
-            "memory_usage": f"{((mem_total - mem_available) / mem_total * 100):.1f}%",
-            "disk_used": disk_parts[2],
-            "disk_free": disk_parts[3],
-            "disk_usage": disk_parts[4],
-            "cpu_usage": f"{cpu_usage:.1f}%",
-            "uptime": uptime_str,
-            "load_avg": os.getloadavg()[0]
+        # Display strings kept alongside the numeric fields for the existing pages
+        legacy = {
+            "memory_total": f"{memory['total']:.0f}MB",
+            "memory_available": f"{memory['available']:.0f}MB", 
+            "memory_usage": f"{memory['used_percent']:.1f}%",
+            "cpu_usage": f"{metrics['cpu']['percent']:.1f}%",
+            "uptime": str(timedelta(seconds=int(metrics['uptime_seconds']))),
+            "load_avg": metrics["load"]["1m"]
         }
+        if root_disk:
+            legacy.update({
+                "disk_used": sysmetrics.human_size(root_disk["used"]),
+                "disk_free": sysmetrics.human_size(root_disk["free"]),
+                "disk_usage": f"{math.ceil(root_disk['used_percent'])}%"
+            })
+        
+        return dict(legacy, **metrics)
     except Exception as e:
         return {"error": str(e)}
 
+@collector("memory_summary", interval=120, cost="io",
+           schema={"daily_log": (str, None), "long_term_memory": (str, None), "key_insights": list})
 def get_memory_summary():
     """Key points from memory files"""
     try:
-        workspace = Path("/home/digized/.openclaw/workspace")
+        workspace = workspace_path()
         today = datetime.now().strftime("%Y-%m-%d")
         
         summary = {
@@ -86,73 +164,100 @@ def get_memory_summary():
             "key_insights": []
         }
         
-        # Today's memory
-        daily_file = workspace / "memory" / f"{today}.md"
-        if daily_file.exists():
-            with open(daily_file, 'r') as f:
-                content = f.read()
-                # Get last few entries
-                lines = content.split('\n')
-                summary["daily_log"] = '\n'.join(lines[-20:]) if len(lines) > 20 else content
+        # Today's memory - last few entries, read incrementally as the log grows
+        lines = daily_log.tail(workspace / "memory" / f"{today}.md", 20)
+        if lines:
+            summary["daily_log"] = '\n'.join(lines)
         
-        # Long-term memory
-        memory_file = workspace / "MEMORY.md"
-        if memory_file.exists():
-            with open(memory_file, 'r') as f:
-                content = f.read()
-                # Get key sections
-                sections = content.split('##')
-                summary["long_term_memory"] = sections[-1] if sections else content[:500]
+        # Long-term memory - latest section, re-indexed only when MEMORY.md changes
+        summary["long_term_memory"] = memory_index.last_section(workspace / "MEMORY.md")
+        summary["long_term_sections"] = memory_index.headings(workspace / "MEMORY.md")
         
         return summary
     except Exception as e:
         return {"error": str(e)}
 
+def _is_openclaw(name, cmdline):
+    return any('openclaw' in item.lower() for item in cmdline)
+
+def _is_dashboard_server(name, cmdline):
+    return name.startswith('python') and any(item.endswith('serve.py') for item in cmdline)
+
+def _register_process_matchers():
+    """Built-in matchers plus any process_patterns from the dashboard config"""
+    scanner.register("openclaw", _is_openclaw)
+    scanner.register("dashboard_server", _is_dashboard_server)
+    patterns = config.get("process_patterns") or {}
+    for name in [name for name in scanner.matchers if name.startswith("pattern:")]:
+        if name[len("pattern:"):] not in patterns:
+            scanner.unregister(name)
+    for name, pattern in patterns.items():
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            print(f"Invalid process pattern {name!r}: {e}")
+            continue
+        scanner.register(f"pattern:{name}", lambda _name, cmdline, regex=regex: bool(regex.search(' '.join(cmdline))))
+
+@collector("current_activity", interval=10, cost="io", timeout=3.0,
+           schema={"status": str, "processes": list, "dashboard_server": str, "last_update": str})
 def get_current_activity():
     """What I'm doing right now"""
     try:
-        # Check OpenClaw processes
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if any('openclaw' in str(item).lower() for item in proc.info['cmdline'] or []):
-                    processes.append({
-                        "pid": proc.info['pid'],
-                        "name": proc.info['name'],
-                        "command": ' '.join(proc.info['cmdline'] or [])[:100]
-                    })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        # Current dashboard status
-        dashboard_running = any(proc.info['name'] == 'python3' and 'serve.py' in str(proc.info['cmdline']) 
-                               for proc in psutil.process_iter(['name', 'cmdline']))
+        _register_process_matchers()
+        matches = scanner.scan()
         
         return {
             "status": "Building comprehensive dashboard",
-            "processes": processes,
-            "dashboard_server": "Running" if dashboard_running else "Stopped",
+            "processes": matches["openclaw"],
+            "dashboard_server": "Running" if matches["dashboard_server"] else "Stopped",
+            "watched_processes": {name[len("pattern:"):]: procs for name, procs in matches.items()
+                                  if name.startswith("pattern:")},
+            "process_scan": scanner.last_scan,
             "last_update": datetime.now().strftime("%H:%M:%S")
         }
     except Exception as e:
         return {"error": str(e)}
 
+# Top-level workspace files each project counts, and the tree whose size is reported
+WORKSPACE_FILE_SETS = {
+    "mount_files": ["*mount*", "camera*"],
+    "project_files": ["*PROJECT*", "README*.md"]
+}
+DASHBOARD_TREE = "digiclaw-dashboard"
+
+def _workspace_index(workspace):
+    """The running watcher if it indexes this workspace, else None (callers glob instead)"""
+    index = watcher.current
+    if index is not None and index.ready() and index.root == workspace:
+        return index
+    return None
+
+@collector("projects", interval=300, cost="io", timeout=5.0,  # refreshed early by workspace watcher events
+           schema=[{"name": str, "status": str, "progress": (int, float), "files": int}])
 def get_active_projects():
     """Current projects and their real status"""
     try:
-        workspace = Path("/home/digized/.openclaw/workspace")
-        projects = []
+        workspace = workspace_path()
+        dashboard_dir = workspace / DASHBOARD_TREE
+        index = _workspace_index(workspace)
+        
+        if index:
+            mount_files = index.files("mount_files")
+            project_files = index.files("project_files")
+            dashboard_exists = index.tree_exists()
+            dashboard_files = index.tree_count() if dashboard_exists else 0
+        else:
+            mount_files = [path for pattern in WORKSPACE_FILE_SETS["mount_files"] for path in workspace.glob(pattern)]
+            project_files = [path for pattern in WORKSPACE_FILE_SETS["project_files"] for path in workspace.glob(pattern)]
+            dashboard_exists = dashboard_dir.exists()
+            dashboard_files = len(list(dashboard_dir.rglob("*"))) if dashboard_exists else 0
         
         # Camera mount project
-        mount_files = list(workspace.glob("*mount*")) + list(workspace.glob("camera*"))
         mount_progress = 85 if mount_files else 70
         
         # Dashboard project  
-        dashboard_dir = workspace / "digiclaw-dashboard"
-        dashboard_progress = 75 if dashboard_dir.exists() else 0
-        
-        # Check for other project files
-        project_files = list(workspace.glob("*PROJECT*")) + list(workspace.glob("README*.md"))
+        dashboard_progress = 75 if dashboard_exists else 0
         
         projects = [
             {
@@ -160,7 +265,7 @@ def get_active_projects():
                 "status": "Building real-time status system",
                 "progress": 60,
                 "last_update": datetime.now().strftime("%H:%M"),
-                "files": len(list(dashboard_dir.rglob("*"))) if dashboard_dir.exists() else 0
+                "files": dashboard_files
             },
             {
                 "name": "Camera Mount System", 
@@ -182,68 +287,66 @@ def get_active_projects():
     except Exception as e:
         return [{"error": str(e)}]
 
-def get_cron_status():
-    """Status of scheduled jobs"""
+@collector("workspace_changes", interval=300, cost="cheap",
+           schema={"watching": bool, "changes": [{"time": str, "path": str, "change": str}]})
+def get_workspace_changes():
+    """Recent file changes seen by the workspace watcher"""
     try:
-        # This would ideally integrate with OpenClaw's cron system
+        index = _workspace_index(workspace_path())
+        if not index:
+            return {"watching": False, "changes": []}
         return {
-            "total_jobs": 3,
-            "active_jobs": 2, 
-            "last_cleanup": "16:40",
-            "next_daily_update": "10:00 tomorrow",
-            "status": "Cleaned up - no failed jobs"
+            "watching": True,
+            "backend": index.backend,
+            "changes": index.changes(20)[::-1]
         }
     except Exception as e:
         return {"error": str(e)}
 
+@collector("nodes", interval=30, cost="cheap",  # refreshed early when a node goes up or down
+           schema=dict)
 def get_node_status():
     """Status of connected nodes"""
     try:
-        # This would integrate with OpenClaw's node system
-        return {
-            "digized_rig": {"status": "online", "last_seen": "17:20"},
-            "digized_mbp": {"status": "offline", "last_seen": "unknown"},
-            "iphone": {"status": "offline", "last_seen": "unknown"}
-        }
+        # Probes run on the monitor's own loop; this only reads their latest results
+        return nodeprobe.monitor.configure(config.get("nodes")).status()
     except Exception as e:
         return {"error": str(e)}
 
+@collector("recent_conversations", interval=30, cost="io", schema=[str])
 def get_recent_conversations():
     """Recent interactions and decisions"""
     try:
         # Get recent log entries
-        workspace = Path("/home/digized/.openclaw/workspace")
+        workspace = workspace_path()
         today = datetime.now().strftime("%Y-%m-%d")
         daily_file = workspace / "memory" / f"{today}.md"
         
         conversations = []
-        if daily_file.exists():
-            with open(daily_file, 'r') as f:
-                lines = f.readlines()
-                for line in lines[-10:]:
-                    if line.strip() and not line.startswith('#'):
-                        conversations.append(line.strip())
+        lines = daily_log.tail(daily_file, 11)
+        # The final element is the unterminated remainder, empty when the file ends with a newline
+        for line in (lines if lines and lines[-1] else lines[:-1])[-10:]:
+            if line.strip() and not line.startswith('#'):
+                conversations.append(line.strip())
         
         return conversations[-5:] if conversations else ["Building comprehensive status system"]
     except Exception as e:
         return [f"Error: {str(e)}"]
 
+@collector("autonomous_work", interval=60, cost="cheap",  # refreshed early when an event is logged
+           schema=[{"action": str, "time": str}])
 def get_autonomous_work():
-    """Autonomous initiatives and decisions"""
+    """Autonomous initiatives and decisions - the newest entries of the event log"""
     try:
-        workspace = Path("/home/digized/.openclaw/workspace")
-        
-        autonomous_work = [
-            {"action": "Built comprehensive status API", "time": datetime.now().strftime("%H:%M"), "type": "initiative"},
-            {"action": "Cleaned up broken cron jobs", "time": "16:40", "type": "maintenance"},
-            {"action": "Replaced mock data with real endpoints", "time": "17:26", "type": "improvement"},
-            {"action": "Created GitHub repository", "time": "17:20", "type": "infrastructure"}
-        ]
-        
-        return autonomous_work
+        if eventlog.current is None:
+            return []
+        events, _ = eventlog.current.query(limit=10)
+        return [{"action": event["text"], "time": event["time"], "type": event["type"], "id": event["id"]}
+                for event in reversed(events)]
     except Exception as e:
         return [{"error": str(e)}]
 
+@collector("next_actions", interval=300, cost="cheap", schema=[{"action": str, "priority": str}])
 def get_next_actions():
     """Planned next steps"""
     return [
@@ -253,18 +356,134 @@ def get_next_actions():
         {"action": "Expand memory analysis capabilities", "priority": "medium", "eta": "this week"}
     ]
 
-def get_performance_metrics():
+@collector("performance", interval=30, cost="cheap", depends=["system"],
+           schema={"response_time": str, "cpu_avg_1h": str, "uptime": str, "requests": dict})
+def get_performance_metrics(inputs):
     """Performance tracking over time"""
     try:
+        response_ms = history.store.mean("latency", 3600)
+        cpu = history.store.mean("cpu", 3600)
+        uptime = int(time.time() - history.store.started)
+        # Server-side request and collector counters, the same ones /api/metrics exposes
+        requests = metrics.registry.summary()
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
         return {
-            "response_time": "< 2s",
-            "uptime": "99.8%",
-            "tasks_completed_today": 8,
-            "autonomous_decisions": 4,
-            "github_commits": 3
+            "response_time": f"{response_ms:.1f}ms" if response_ms is not None else "n/a",
+            "response_time_p95": f"{requests['latency_p95_ms']}ms" if requests["latency_p95_ms"] is not None else "n/a",
+            "cpu_avg_1h": f"{cpu:.1f}%" if cpu is not None else "n/a",
+            "cpu_now": inputs.get("system", {}).get("cpu_usage", "n/a"),
+            "uptime": str(timedelta(seconds=uptime)),
+            "requests": requests,
+            # Collection mode and what the dashboard itself costs the machine it monitors
+            "dashboard": pacing.pacer.describe(),
+            # What agents and scripts logged today, by event type
+            "events_today": eventlog.current.counts(midnight) if eventlog.current else {}
         }
     except Exception as e:
         return {"error": str(e)}
 
+PLUGIN_DIR = Path(__file__).parent / "plugins"
+
+def load_plugins(directory=None):
+    """Register collectors from every plugins/*.py that defines register(collector)"""
+    directory = Path(directory or config.get("plugin_dir") or PLUGIN_DIR)
+    for path in sorted(directory.glob("*.py")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            spec = importlib.util.spec_from_file_location(f"digiclaw_plugin_{path.stem}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.register(collector)
+        except Exception as e:
+            print(f"Skipping collector plugin {path.name}: {e}")
+
+load_plugins()
+
+# Section name -> collector function, in payload order
+SECTIONS = {name: entry.func for name, entry in COLLECTORS.items()}
+
+# Seconds a collector may take before its last-known value is served instead
+DEFAULT_COLLECTOR_TIMEOUT = 2.0
+
+_collector_pool = ThreadPoolExecutor(max_workers=len(COLLECTORS), thread_name_prefix="collector")
+_collector_lock = threading.Lock()
+_inflight = {}
+_last_known = {}
+
+def _latest(name, futures, timeouts, started):
+    """A dependency's value from this pass if it is running in it, else its last-known value"""
+    if name in futures:
+        remaining = started + timeouts.get(name, DEFAULT_COLLECTOR_TIMEOUT) - time.monotonic()
+        try:
+            return futures[name].result(timeout=max(remaining, 0))[0]
+        except FutureTimeout:
+            pass
+    with _collector_lock:
+        return _last_known.get(name, ({},))[0]
+
+def _run_timed(entry, futures, timeouts, started):
+    inputs = {name: _latest(name, futures, timeouts, started) for name in entry.depends}
+    started = time.perf_counter()
+    try:
+        value = entry(inputs)
+    except Exception as e:
+        value = {"error": str(e)}
+    try:
+        apicodec.dumps(value)
+    except (TypeError, ValueError, OverflowError) as e:
+        # Output the snapshot cannot encode fails this section only, like an exception
+        value = {"error": f"Result is not JSON-encodable: {e}"}
+    duration_ms = (time.perf_counter() - started) * 1000
+    with _collector_lock:
+        _last_known[entry.name] = (value, datetime.now().isoformat(timespec="seconds"), duration_ms)
+    return value, duration_ms
+
+def run_collectors(sections=None, timeouts=None):
+    """Run collectors in parallel, each against its own deadline
+    
+    Returns (results, timings). A collector that misses its deadline keeps running in the
+    background and its last-known value is returned with "stale": true in timings.
+    Collectors wait for dependencies running in the same pass.
+    """
+    names = [name for name in (sections or COLLECTORS) if name in COLLECTORS]
+    timeouts = dict({name: entry.timeout for name, entry in COLLECTORS.items() if entry.timeout},
+                    **(timeouts or {}))
+    started = time.monotonic()
+    
+    futures = {}
+    with _collector_lock:
+        # Registration order puts dependencies first, so their futures exist before dependents start
+        for name in names:
+            # Never stack a second run on top of a collector that is still stuck
+            future = _inflight.get(name)
+            if future is None or future.done():
+                future = _collector_pool.submit(_run_timed, COLLECTORS[name], dict(futures), timeouts, started)
+                _inflight[name] = future
+            futures[name] = future
+    
+    results = {}
+    timings = {}
+    for name in names:
+        remaining = started + timeouts.get(name, DEFAULT_COLLECTOR_TIMEOUT) - time.monotonic()
+        try:
+            value, duration_ms = futures[name].result(timeout=max(remaining, 0))
+            results[name] = value
+            timings[name] = {"duration_ms": round(duration_ms, 1), "stale": False,
+                             "collected_at": datetime.now().isoformat(timespec="seconds")}
+            problems = [] if isinstance(value, dict) and "error" in value else check_schema(value, COLLECTORS[name].schema)
+            if problems:
+                timings[name]["schema_errors"] = problems[:5]
+        except FutureTimeout:
+            with _collector_lock:
+                value, collected_at, duration_ms = _last_known.get(
+                    name, ({"error": "Collector timed out"}, None, None))
+            results[name] = value
+            timings[name] = {"duration_ms": round((time.monotonic() - started) * 1000, 1), "stale": True,
+                             "collected_at": collected_at}
+        timings[name]["cost"] = COLLECTORS[name].cost
+    
+    return results, timings
+
 if __name__ == "__main__":
     print(json.dumps(get_comprehensive_status(), indent=2))
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw API Response Encoding
+Fast JSON when orjson is installed, MessagePack when msgpack is, and gzip built once per snapshot version
+"""
+
+import gzip
+import json
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MIN_COMPRESS_BYTES = 512   # smaller bodies are sent as-is - gzip overhead outweighs the saving
+GZIP_LEVEL = 6
+CACHE_ENTRIES = 32
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+def dumps(value):
+    """JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value).encode()
+
+def packb(value):
+    """MessagePack bytes; raises RuntimeError when msgpack is not installed"""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(value, use_bin_type=True)
+
+class EncodedCache:
+    """Encoded bodies keyed by what they encode (e.g. ("status", version)), so N clients share one encode
+
+    Keys carry the snapshot version, so old entries simply age out of the LRU.
+    """
+
+    def __init__(self, entries=CACHE_ENTRIES):
+        self.entries = entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def get(self, key, build):
+        """Cached value for key, calling build() once on a miss"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            value = build()
+            self._cache[key] = value
+            if len(self._cache) > self.entries:
+                self._cache.popitem(last=False)
+            return value
+
+    def gzip(self, key, body):
+        """gzip of body, cached under key; with no key it is compressed every time"""
+        if key is None:
+            return gzip.compress(body, GZIP_LEVEL, mtime=0)
+        return self.get(("gzip",) + tuple(key), lambda: gzip.compress(body, GZIP_LEVEL, mtime=0))
+
+# Shared by every API route
+cache = EncodedCache()
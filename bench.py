@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Dashboard Benchmark
+Starts serve.py on loopback against a synthetic workspace, drives it with concurrent clients,
+and times every api.py collector in-process
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import psutil
+
+from engines import ENGINES, DEFAULT_WORKERS
+
+DASHBOARD_DIR = Path(__file__).parent.resolve()
+DEFAULT_PATHS = ["/api/status", "/api/system", "/comprehensive.html", "/style.css", "/dashboard.js"]
+
+def make_workspace(root, tree_files=500, log_lines=2000, memory_sections=200):
+    """Synthetic OpenClaw workspace shaped like the real one"""
+    root = Path(root)
+    (root / "memory").mkdir(parents=True, exist_ok=True)
+    today = datetime.now().strftime("%Y-%m-%d")
+    with open(root / "memory" / f"{today}.md", "w") as f:
+        f.write(f"# {today}\n")
+        for i in range(log_lines):
+            f.write(f"- {i:05d} worked on dashboard benchmark item {i}\n")
+    with open(root / "MEMORY.md", "w") as f:
+        for i in range(memory_sections):
+            f.write(f"## Section {i}\n" + "Remembered detail.\n" * 5)
+    for name in ("camera_mount_v2.stl", "camera_arm.scad", "base_mount.stl", "PROJECT_NOTES.md", "README.md"):
+        (root / name).write_text("fixture\n")
+    tree = root / "digiclaw-dashboard"
+    for i in range(tree_files):
+        directory = tree / f"dir{i % 20:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{i:04d}.txt").write_text("x" * 64)
+    return root
+
+def write_config(path, workspace):
+    """Config with no nodes, so the benchmark never probes the network"""
+    Path(path).write_text(json.dumps({"workspace": str(workspace), "nodes": [], "mount_points": ["/"]}))
+    return path
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+def start_server(port, env, engine, workers):
+    command = [sys.executable, str(DASHBOARD_DIR / "serve.py"), "--bind", "127.0.0.1", "--port", str(port),
+               "--no-persist", "--engine", engine, "--workers", str(workers)]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/status")
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("serve.py did not start within 30s")
+
+def load(port, paths, concurrency, duration, requests):
+    """Keep-alive clients cycling through paths; returns {path: [latency ms]} and error count"""
+    results = {path: [] for path in paths}
+    errors = [0]
+    lock = threading.Lock()
+    issued = [0]
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        latencies = {path: [] for path in paths}
+        failed = 0
+        i = offset
+        while True:
+            with lock:
+                if (requests and issued[0] >= requests) or (not requests and time.monotonic() >= stop_at):
+                    break
+                issued[0] += 1
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            latencies[path].append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            for path, values in latencies.items():
+                results[path].extend(values)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors[0], time.perf_counter() - started
+
+def run_load(args, env):
+    port = free_port()
+    process = start_server(port, env, args.engine, args.workers)
+    server = psutil.Process(process.pid)
+    rss_idle = server.memory_info().rss
+    peak = [rss_idle]
+    sampling = threading.Event()
+
+    def sample_rss():
+        while not sampling.wait(0.2):
+            try:
+                peak[0] = max(peak[0], server.memory_info().rss)
+            except psutil.Error:
+                return
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    try:
+        results, errors, elapsed = load(port, args.paths, args.concurrency, args.duration, args.requests)
+    finally:
+        sampling.set()
+        process.terminate()
+        process.wait(timeout=10)
+
+    total = sum(len(values) for values in results.values())
+    report = {
+        "engine": args.engine,
+        "concurrency": args.concurrency,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0,
+        "rss_idle_mb": round(rss_idle / 1048576, 1),
+        "rss_peak_mb": round(peak[0] / 1048576, 1),
+        "paths": {}
+    }
+    everything = [value for values in results.values() for value in values]
+    for path, values in list(results.items()) + [("all", everything)]:
+        report["paths"][path] = {
+            "count": len(values),
+            "p50_ms": _round(percentile(values, 0.50)),
+            "p95_ms": _round(percentile(values, 0.95)),
+            "p99_ms": _round(percentile(values, 0.99))
+        }
+    return report
+
+def run_micro(iterations):
+    """Time each registered collector in-process against the fixture workspace"""
+    import api
+    report = {}
+    for name, entry in api.COLLECTORS.items():
+        inputs = {dependency: api.COLLECTORS[dependency]({}) for dependency in entry.depends}
+        entry(inputs)  # warm caches (tail offsets, process cache) the way a running server has them
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            entry(inputs)
+            timings.append((time.perf_counter() - started) * 1000)
+        report[name] = {
+            "cost": entry.cost,
+            "mean_ms": _round(sum(timings) / len(timings), 3),
+            "p50_ms": _round(percentile(timings, 0.50), 3),
+            "p95_ms": _round(percentile(timings, 0.95), 3)
+        }
+    return report
+
+def _round(value, digits=2):
+    return None if value is None else round(value, digits)
+
+def print_report(result):
+    if "load" in result:
+        load_report = result["load"]
+        print(f"⚡ Load: {load_report['requests']} requests in {load_report['seconds']}s "
+              f"({load_report['throughput_rps']} req/s, {load_report['errors']} errors) - "
+              f"{load_report['engine']} engine, {load_report['concurrency']} clients")
+        print(f"   RSS {load_report['rss_idle_mb']} MB idle, {load_report['rss_peak_mb']} MB peak")
+        print(f"   {'path':<24} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for path, stats in load_report["paths"].items():
+            print(f"   {path:<24} {stats['count']:>7} {stats['p50_ms']!s:>9} {stats['p95_ms']!s:>9} {stats['p99_ms']!s:>9}")
+    if "collectors" in result:
+        print("⏱️  Collectors (in-process)")
+        print(f"   {'collector':<24} {'cost':<11} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, stats in result["collectors"].items():
+            print(f"   {name:<24} {stats['cost']:<11} {stats['mean_ms']!s:>9} {stats['p50_ms']!s:>9} {stats['p95_ms']!s:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Digiclaw Dashboard Benchmark")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument("--duration", "-d", type=float, default=10, help="Seconds to run (default: 10)")
+    parser.add_argument("--requests", "-n", type=int, default=0, help="Stop after this many requests instead")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS, help="Paths to request, round-robin")
+    parser.add_argument("--engine", choices=ENGINES, default="threaded", help="serve.py engine (default: threaded)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"serve.py worker pool size (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--iterations", type=int, default=50, help="Runs per collector microbenchmark")
+    parser.add_argument("--workspace", help="Use this workspace instead of a generated fixture")
+    parser.add_argument("--tree-files", type=int, default=500, help="Files in the fixture's dashboard tree")
+    parser.add_argument("--no-load", action="store_true", help="Skip the HTTP load test")
+    parser.add_argument("--no-micro", action="store_true", help="Skip collector microbenchmarks")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="digiclaw-bench-") as tmp:
+        workspace = Path(args.workspace) if args.workspace else make_workspace(Path(tmp) / "workspace", args.tree_files)
+        config_path = write_config(Path(tmp) / "dashboard-config.json", workspace)
+        # Set before api/config are imported so the in-process collectors see the fixture too
+        os.environ["DIGICLAW_CONFIG"] = str(config_path)
+        os.environ["DIGICLAW_WORKSPACE"] = str(workspace)
+        env = dict(os.environ)
+
+        result = {"workspace": str(workspace)}
+        if not args.no_load:
+            result["load"] = run_load(args, env)
+        if not args.no_micro:
+            result["collectors"] = run_micro(args.iterations)
+
+    print_report(result)
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Background Snapshot Collector
+Refreshes each status section on its own schedule so HTTP handlers never wait on collection
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import apicodec
+
+# Seconds a section may be overdue before a request collects it itself instead of waiting
+OVERDUE_GRACE = 5
+
+class SnapshotCollector:
+    """Keeps the latest comprehensive status pre-serialized for the HTTP handlers"""
+
+    def __init__(self, load_api, intervals=None, fallback=None):
+        self.load_api = load_api
+        # Overrides for the intervals collectors declare in api.py
+        self.intervals = dict(intervals or {})
+        self.fallback = fallback
+        self.sections = {}
+        self.next_due = {}
+        # Declared interval (after the cost stretch) and finish time of each section's last run
+        self.base_intervals = {}
+        self.last_run = {}
+        # Optional interval -> interval hook applied on top, e.g. pacing.pacer.pace
+        self.pace = None
+        self.timings = {}
+        self.collector_info = {}
+        self._lock = threading.Lock()
+        self._status = {}
+        self._body = b"{}"
+        # Versions start from the clock so a restarted server never reuses an old number
+        self.version = int(time.time() * 1000)
+        self._timestamp = None
+        self._section_bodies = {}
+        self._section_versions = {}
+        self._deltas = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # Re-entrant: listeners render views, which may ensure() from inside a refresh
+        self._refresh_lock = threading.RLock()
+        self._invalidated = set()
+        self._thread = None
+        self.listeners = []
+
+    def start(self):
+        """Collect every section once, then keep refreshing in the background"""
+        self.refresh(force=True)
+        self._thread = threading.Thread(target=self._run, name="snapshot-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def add_listener(self, listener):
+        """Call listener(updated_sections, status) after each refresh"""
+        self.listeners.append(listener)
+
+    def invalidate(self, *sections):
+        """Make sections due now and wake the background loop to collect them"""
+        with self._lock:
+            self._invalidated.update(sections)
+        self._wake.set()
+
+    def reschedule(self):
+        """Recompute every next_due through the pace hook - call when the pacing mode changes
+        
+        Not under the refresh lock, so a request leaving idle mode never waits on a collection.
+        """
+        for section, interval in list(self.base_intervals.items()):
+            self.next_due[section] = self.last_run[section] + self._paced(interval)
+        self._wake.set()
+
+    def _paced(self, interval):
+        return self.pace(interval) if self.pace else interval
+
+    def snapshot(self):
+        """Latest status dict - treat as read-only"""
+        with self._lock:
+            return self._status
+
+    def snapshot_bytes(self):
+        """Latest status as pre-encoded JSON"""
+        with self._lock:
+            return self._body
+
+    def versioned_bytes(self):
+        """(version, latest status JSON) read together"""
+        with self._lock:
+            return self.version, self._body
+
+    def section_versions(self):
+        with self._lock:
+            return self.version, dict(self._section_versions)
+
+    def snapshot_versions(self):
+        """(status dict, {section: version}) read together"""
+        with self._lock:
+            return self._status, dict(self._section_versions)
+
+    def delta_bytes(self, since):
+        """(version, JSON with only the sections changed after `since`) - body is None when nothing changed"""
+        with self._lock:
+            if since == self.version:
+                return self.version, None
+            if since > self.version:
+                return self.version, self._body
+            cached = self._deltas.get(since)
+            if cached is None:
+                if len(self._deltas) >= 64:
+                    self._deltas = {}
+                changed = [name for name, version in self._section_versions.items() if version > since]
+                cached = self._compose(changed, b'"delta": true, "since": %d' % since)
+                self._deltas[since] = cached
+            return self.version, cached
+
+    def ensure(self, sections=None):
+        """Collect, right now, any of sections never collected or overdue by more than OVERDUE_GRACE
+        
+        The cheap check runs on every request; collectors only run on a miss, and only the
+        ones asked for.
+        """
+        if sections is None:
+            sections = list(self.load_api().COLLECTORS)
+        if self._missing(sections, time.monotonic()):
+            self.refresh(sections=sections)
+
+    def _missing(self, sections, now):
+        return [section for section in sections
+                if section not in self.sections or now - self.next_due.get(section, 0) > OVERDUE_GRACE]
+
+    def refresh(self, force=False, sections=None):
+        """Run every section that is due (or only the missing ones of sections) and publish a new snapshot"""
+        with self._refresh_lock:
+            self._refresh(force, sections)
+
+    def _refresh(self, force, sections):
+        now = time.monotonic()
+        try:
+            api = self.load_api()
+        except Exception as e:
+            print(f"Error loading comprehensive data: {e}")
+            if self.fallback:
+                self._publish(self.fallback(e))
+            return
+
+        if sections is not None:
+            # A view's cache miss - another thread may have filled it while we waited for the lock
+            due = [section for section in self._missing(sections, now) if section in api.COLLECTORS]
+            if not due:
+                return
+        else:
+            with self._lock:
+                # Invalidations arriving while this pass runs stay queued for the next one
+                invalidated, self._invalidated = self._invalidated, set()
+            due = [section for section in api.COLLECTORS
+                   if force or section in invalidated or self.next_due.get(section, 0) <= now]
+        if due:
+            results, timings = api.run_collectors(due)
+            self.sections.update(results)
+            self.collector_info.update(timings)
+            for section in due:
+                self.timings[section] = timings[section]["duration_ms"]
+                # Declared cost decides how far the interval stretches after a slow run
+                interval = api.COLLECTORS[section].next_interval(timings[section]["duration_ms"],
+                                                                 self.intervals.get(section))
+                self.base_intervals[section] = interval
+                self.last_run[section] = time.monotonic()
+                self.next_due[section] = self.last_run[section] + self._paced(interval)
+
+        status = {"timestamp": datetime.now().isoformat()}
+        for section in api.COLLECTORS:
+            if section in self.sections:
+                status[section] = self.sections[section]
+        status["collectors"] = dict(self.collector_info)
+        self._publish(status, due + ["collectors"])
+        for listener in self.listeners:
+            try:
+                listener(due, status)
+            except Exception as e:
+                print(f"Snapshot listener failed: {e}")
+
+    def _publish(self, status, updated=None):
+        """Swap in a new snapshot, bumping the version of every section whose JSON changed"""
+        names = [name for name in status if name != "timestamp"]
+        encoded = {name: apicodec.dumps(status[name]) for name in names
+                   if updated is None or name in updated or name not in self._section_bodies}
+        with self._lock:
+            for name, body in encoded.items():
+                if self._section_bodies.get(name) != body:
+                    self.version += 1
+                    self._section_versions[name] = self.version
+            self._section_bodies = {name: encoded.get(name, self._section_bodies.get(name)) for name in names}
+            self._section_versions = {name: self._section_versions[name] for name in names}
+            self._timestamp = status.get("timestamp")
+            self._status = dict(status, version=self.version)
+            self._body = self._compose(names)
+            self._deltas = {}
+
+    def _compose(self, names, extra=None):
+        """Assemble a payload from the cached per-section JSON - unchanged sections are never re-encoded"""
+        parts = [b'"timestamp": ' + apicodec.dumps(self._timestamp), b'"version": %d' % self.version]
+        if extra:
+            parts.append(extra)
+        parts += [apicodec.dumps(name) + b": " + self._section_bodies[name] for name in names]
+        return b"{" + b", ".join(parts) + b"}"
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # A failed pass must not end collection - the next one retries
+                print(f"Snapshot refresh failed: {e}")
+            wait = min(self.next_due.values(), default=time.monotonic() + 5) - time.monotonic()
+            self._wake.wait(max(wait, 0.1))
+            self._wake.clear()
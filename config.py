@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Dashboard Configuration
+Loads dashboard-config.json (or $DIGICLAW_CONFIG) over built-in defaults
+"""
+
+import json
+import os
+from pathlib import Path
+
+CONFIG_PATH = Path(os.environ.get("DIGICLAW_CONFIG", Path(__file__).parent / "dashboard-config.json"))
+
+DEFAULTS = {
+    # OpenClaw workspace read by the status collectors ($DIGICLAW_WORKSPACE overrides)
+    "workspace": "/home/digized/.openclaw/workspace",
+    # Extra processes to watch: name -> regex matched against the full command line
+    "process_patterns": {},
+    # Mount points reported by the system metrics collector
+    "mount_points": ["/"],
+    # Hosts probed for the Connected Nodes card: name, host and optionally label, port,
+    # check ("tcp" connect or "http" GET of path), interval and timeout in seconds
+    "nodes": [
+        {"name": "digized_rig", "label": "digized-rig", "host": "digized-rig.local", "port": 22},
+        {"name": "digized_mbp", "label": "digized-mbp", "host": "digized-mbp.local", "port": 22},
+        {"name": "iphone", "label": "iPhone", "host": "digized-iphone.local", "port": 62078}
+    ],
+    # Peer dashboards merged into /api/fleet: name, url (e.g. "http://pi2.local:8080") and
+    # optionally timeout in seconds - any peers turn on aggregator mode
+    "peers": [],
+    # Directory of collector plugin files (default: plugins/ next to api.py)
+    "plugin_dir": None
+}
+
+_cache = {"mtime": None, "config": dict(DEFAULTS)}
+
+def load_config():
+    """Current configuration, re-read only when the file changes"""
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime
+    except OSError:
+        return _cache["config"]
+    if mtime != _cache["mtime"]:
+        try:
+            with open(CONFIG_PATH, 'r') as f:
+                _cache["config"] = dict(DEFAULTS, **json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Error loading {CONFIG_PATH.name}: {e}")
+        _cache["mtime"] = mtime
+    return _cache["config"]
+
+def get(key):
+    if key == "workspace" and os.environ.get("DIGICLAW_WORKSPACE"):
+        return os.environ["DIGICLAW_WORKSPACE"]
+    return load_config().get(key, DEFAULTS.get(key))
@@ -4,25 +4,62 @@ class DigiclawDashboard {
     constructor() {
         this.updateInterval = 30000; // 30 seconds
         this.lastUpdateTime = null;
+        this.lastEventId = null; // cursor into /api/events - only newer events are fetched
+        this.activityLoad = null; // the one /api/events load in flight
+        this.activityReload = false;
+        this.lastActivities = null;
+        this.maxActivityItems = 10;
         this.init();
     }
 
     init() {
         this.updateTimeDisplay();
-        this.loadSystemStatus();
         this.loadRecentActivity();
         this.loadProjects();
         
-        // Start update loop
-        setInterval(() => {
-            this.updateTimeDisplay();
+        if (window.EventSource) {
+            this.connectStream();
+        } else {
+            // Start update loop
             this.loadSystemStatus();
-            this.loadRecentActivity();
-        }, this.updateInterval);
+            setInterval(() => {
+                this.updateTimeDisplay();
+                this.loadSystemStatus();
+                this.loadRecentActivity();
+            }, this.updateInterval);
+        }
 
         console.log('🔥 Digiclaw Dashboard initialized');
     }
 
+    connectStream() {
+        // Pushed by the server whenever a new snapshot is collected
+        this.source = new EventSource('/api/stream?view=system');
+        this.source.addEventListener('system', (event) => {
+            this.updateTimeDisplay();
+            const data = JSON.parse(event.data);
+            this.renderSystemData(data);
+            // Most pushes are metric ticks - only new events are worth asking the log about
+            const activities = JSON.stringify(data.activities);
+            if (activities !== this.lastActivities) {
+                this.lastActivities = activities;
+                this.loadRecentActivity();
+            }
+        });
+        this.source.onerror = () => console.log('Live stream disconnected - reconnecting');
+        if (!this.watchingVisibility) {
+            // A hidden tab is not a viewer - disconnect so the server can drop to its idle heartbeat
+            this.watchingVisibility = true;
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden) {
+                    this.source.close();
+                } else if (this.source.readyState === EventSource.CLOSED) {
+                    this.connectStream();
+                }
+            });
+        }
+    }
+
     updateTimeDisplay() {
         const now = new Date();
         const timeString = now.toLocaleTimeString('en-US', { 
@@ -38,20 +75,7 @@ class DigiclawDashboard {
         try {
             // Fetch real system data from Pi
             const systemData = await this.fetchSystemData();
-            
-            document.getElementById('memory-usage').textContent = systemData.memory;
-            document.getElementById('storage-usage').textContent = systemData.storage;
-            
-            // Update activity with real data
-            if (systemData.activities) {
-                this.updateActivityFeed(systemData.activities);
-            }
-            
-            // Update projects with real data  
-            if (systemData.projects) {
-                this.updateProjects(systemData.projects);
-            }
-            
+            this.renderSystemData(systemData);
         } catch (error) {
             console.error('Failed to load system status:', error);
             // Fallback to basic system info
@@ -60,6 +84,21 @@ class DigiclawDashboard {
         }
     }
 
+    renderSystemData(systemData) {
+        document.getElementById('memory-usage').textContent = systemData.memory;
+        document.getElementById('storage-usage').textContent = systemData.storage;
+        
+        // The event log feeds the activity list; these are only used when it is unavailable
+        if (systemData.activities && this.lastEventId === null) {
+            this.updateActivityFeed(systemData.activities);
+        }
+        
+        // Update projects with real data  
+        if (systemData.projects) {
+            this.updateProjects(systemData.projects);
+        }
+    }
+
     async fetchSystemData() {
         try {
             const response = await fetch('/api/system');
@@ -115,9 +154,65 @@ class DigiclawDashboard {
         };
     }
 
-    async loadRecentActivity() {
-        // This gets loaded via loadSystemStatus() for efficiency
-        console.log('Activity feed updated via system status');
+    loadRecentActivity() {
+        // One load at a time - callers share the one in flight, which runs once more if asked meanwhile
+        if (this.activityLoad) {
+            this.activityReload = true;
+            return this.activityLoad;
+        }
+        this.activityLoad = this.fetchActivity().finally(() => {
+            this.activityLoad = null;
+            if (this.activityReload) {
+                this.activityReload = false;
+                this.loadRecentActivity();
+            }
+        });
+        return this.activityLoad;
+    }
+
+    async fetchActivity() {
+        try {
+            let more = true;
+            while (more) {
+                const catchingUp = this.lastEventId !== null;
+                const query = catchingUp
+                    ? `after=${this.lastEventId}&limit=50`
+                    : `limit=${this.maxActivityItems}`;
+                const response = await fetch(`/api/events?${query}`);
+                if (!response.ok) return;
+                const page = await response.json();
+                if (this.lastEventId === null) {
+                    // Still no cursor once the page is in: it replaces the placeholder list
+                    document.getElementById('activity-list').textContent = '';
+                }
+                this.prependActivity(page.events);
+                this.lastEventId = page.next;
+                // Without a cursor `more` means older events exist, which the list does not want
+                more = catchingUp && page.more;
+            }
+        } catch (e) {
+            console.log('Event log not available');
+        }
+    }
+
+    prependActivity(events) {
+        // Add new items at the top and trim the tail - existing items are left untouched
+        const activityList = document.getElementById('activity-list');
+        for (const event of events) {
+            const item = document.createElement('div');
+            item.className = 'activity-item';
+            const time = document.createElement('span');
+            time.className = 'activity-time';
+            time.textContent = event.time;
+            const text = document.createElement('span');
+            text.className = 'activity-text';
+            text.textContent = event.text;
+            item.append(time, text);
+            activityList.prepend(item);
+        }
+        while (activityList.children.length > this.maxActivityItems) {
+            activityList.lastElementChild.remove();
+        }
     }
 
     updateActivityFeed(activities) {
@@ -151,12 +246,6 @@ class DigiclawDashboard {
         `).join('');
     }
 
-    // Future: WebSocket connection for real-time updates
-    connectWebSocket() {
-        // Implementation for real-time Pi communication
-        console.log('WebSocket connection planned for Phase 2');
-    }
-
     // Future: Parse markdown files from workspace
     async parseWorkspaceFiles() {
         // Implementation to read and parse memory files, project files
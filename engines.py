@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Dashboard Server Engines
+Threaded (bounded worker pool) and asyncio HTTP/1.1 engines that both serve the same dashboard app
+"""
+
+import asyncio
+import email.parser
+import email.utils
+import http.client
+import http.server
+import selectors
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from http import HTTPStatus
+
+from stream import SocketSubscriber, StreamWriterSubscriber
+
+ENGINES = ("threaded", "asyncio")
+
+DEFAULT_WORKERS = 8
+REQUEST_TIMEOUT = 15     # seconds allowed to produce one response
+KEEPALIVE_TIMEOUT = 5    # seconds an idle keep-alive connection is held open (costs no worker)
+MAX_HEADER_BYTES = 65536
+
+class Response:
+    """Status, headers and body returned by the dashboard app to whichever engine is running"""
+
+    def __init__(self, status=200, body=b"", headers=None, stream=None):
+        self.status = status
+        self.body = body
+        self.headers = list(headers or [])
+        # stream(subscriber) takes over the connection after the headers (Server-Sent Events)
+        self.stream = stream
+
+def text_response(status, message):
+    return Response(status, message.encode(), [("Content-Type", "text/plain; charset=utf-8")])
+
+def log_request(client, method, target, status):
+    timestamp = datetime.now().strftime("%d/%b/%Y %H:%M:%S")
+    sys.stderr.write(f'{client} - - [{timestamp}] "{method} {target}" {status} -\n')
+
+# --- Threaded engine -------------------------------------------------------
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer that hands connections to a fixed pool instead of one thread per connection
+
+    Workers only hold a connection while a request is in progress. Between requests, keep-alive
+    sockets wait on a selector and go back to the pool when the next request arrives, so idle
+    browsers and phones never starve new clients. App calls run on a second pool so the request
+    timeout can be enforced.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, workers=DEFAULT_WORKERS, backlog=None, timeout=REQUEST_TIMEOUT):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        self.app_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="app")
+        self.request_timeout = timeout
+        # Requests beyond the pool plus a short queue are turned away instead of piling up
+        self.slots = threading.BoundedSemaphore(workers + (workers * 4 if backlog is None else backlog))
+        self._idle = selectors.DefaultSelector()
+        self._idle_lock = threading.Lock()
+        self._closing = False
+        self._idle_thread = threading.Thread(target=self._watch_idle, name="http-keepalive", daemon=True)
+        self._idle_thread.start()
+
+    def process_request(self, request, client_address):
+        self._dispatch(request, client_address)
+
+    def _dispatch(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\nRetry-After: 1\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        handler = None
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if handler is not None and getattr(handler, "detached", False):
+                pass   # streaming connections now belong to the stream hub, not this worker
+            elif handler is not None and handler.park:
+                self._park(request, client_address)
+            else:
+                self.shutdown_request(request)
+            self.slots.release()
+
+    def _park(self, request, client_address):
+        with self._idle_lock:
+            if self._closing:
+                self.shutdown_request(request)
+                return
+            self._idle.register(request, selectors.EVENT_READ, (client_address, time.monotonic()))
+
+    def _watch_idle(self):
+        """Resume parked connections when their next request arrives; close them after KEEPALIVE_TIMEOUT"""
+        while not self._closing:
+            # Sockets parked while this waits are watched straight away; the timeout only paces expiry
+            events = self._idle.select(timeout=0.25)
+            now = time.monotonic()
+            with self._idle_lock:
+                ready = []
+                for key, _ in events:
+                    self._idle.unregister(key.fileobj)
+                    ready.append((key.fileobj, key.data[0]))
+                expired = [key for key in self._idle.get_map().values() if now - key.data[1] > KEEPALIVE_TIMEOUT]
+                for key in expired:
+                    self._idle.unregister(key.fileobj)
+            for request, client_address in ready:
+                self._dispatch(request, client_address)
+            for key in expired:
+                self.shutdown_request(key.fileobj)
+
+    def server_close(self):
+        super().server_close()
+        with self._idle_lock:
+            self._closing = True
+            parked = [key.fileobj for key in self._idle.get_map().values()]
+            for request in parked:
+                self._idle.unregister(request)
+        for request in parked:
+            self.shutdown_request(request)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.app_pool.shutdown(wait=False, cancel_futures=True)
+
+def _has_buffered(rfile, sock):
+    """Whether the next request (or part of it) is already buffered or waiting, without blocking"""
+    timeout = sock.gettimeout()
+    try:
+        sock.setblocking(False)
+        return bool(rfile.peek(1))
+    except OSError:
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+def make_handler(app, timeout=REQUEST_TIMEOUT):
+    """Build a request handler class that dispatches every request to app"""
+
+    class EngineHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "Digiclaw"
+        disable_nagle_algorithm = True
+        park = False
+
+        def handle(self):
+            # One request per worker visit; an idle keep-alive connection is parked, not waited on
+            self.handle_one_request()
+            while not self.close_connection and not getattr(self, "detached", False):
+                if not _has_buffered(self.rfile, self.connection):
+                    self.park = True
+                    return
+                self.handle_one_request()
+
+        def do_GET(self):
+            try:
+                future = self.server.app_pool.submit(app, self.command, self.path, self.headers)
+                response = future.result(timeout=self.server.request_timeout)
+            except FutureTimeout:
+                response = text_response(504, "Request timed out")
+            except Exception as e:
+                self.log_error("Unhandled error for %s: %s", self.path, e)
+                response = text_response(500, "Internal Server Error")
+            self.send_response(response.status)
+            for name, value in response.headers:
+                self.send_header(name, value)
+            if response.stream:
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                self.detached = True
+                response.stream(SocketSubscriber(self.connection))
+                return
+            self.send_header("Content-Length", str(len(response.body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(response.body)
+
+        do_HEAD = do_GET
+
+    # Socket timeout bounds each read and write while a request is in progress
+    EngineHandler.timeout = timeout
+    return EngineHandler
+
+def serve_threaded(app, address, workers=DEFAULT_WORKERS, timeout=REQUEST_TIMEOUT, ready=None):
+    """Serve app until interrupted using a bounded thread pool"""
+    with PooledHTTPServer(address, make_handler(app, timeout), workers, timeout=timeout) as httpd:
+        if ready:
+            ready()
+        httpd.serve_forever()
+
+# --- Asyncio engine --------------------------------------------------------
+
+def _keep_alive(version, headers):
+    connection = (headers.get("Connection") or "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+def _encode_head(response, connection, content_length=None):
+    lines = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}", "Server: Digiclaw",
+             f"Date: {email.utils.formatdate(usegmt=True)}"]
+    lines += [f"{name}: {value}" for name, value in response.headers]
+    if content_length is not None:
+        lines.append(f"Content-Length: {content_length}")
+    lines.append(f"Connection: {connection}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+def _encode_response(response, method, keep_alive):
+    head = _encode_head(response, "keep-alive" if keep_alive else "close", len(response.body))
+    return head if method == "HEAD" else head + response.body
+
+async def _handle_connection(reader, writer, app, pool, timeout):
+    loop = asyncio.get_running_loop()
+    client = (writer.get_extra_info("peername") or ("-",))[0]
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+
+            request_line, _, header_block = head.partition(b"\r\n")
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_encode_response(text_response(400, "Bad Request"), "GET", False))
+                break
+            headers = email.parser.BytesParser(_class=http.client.HTTPMessage).parsebytes(header_block)
+            keep_alive = _keep_alive(version, headers)
+
+            if method not in ("GET", "HEAD"):
+                response = text_response(501, "Not Implemented")
+            else:
+                try:
+                    response = await asyncio.wait_for(
+                        loop.run_in_executor(pool, app, method, target, headers), timeout)
+                except asyncio.TimeoutError:
+                    response = text_response(504, "Request timed out")
+                except Exception as e:
+                    sys.stderr.write(f"Unhandled error for {target}: {e}\n")
+                    response = text_response(500, "Internal Server Error")
+
+            if response.stream:
+                writer.write(_encode_head(response, "close"))
+                await writer.drain()
+                log_request(client, method, target, response.status)
+                response.stream(StreamWriterSubscriber(loop, writer))
+                # Hold the connection until the viewer leaves or the hub drops it
+                while await reader.read(1024):
+                    pass
+                break
+
+            writer.write(_encode_response(response, method, keep_alive))
+            await writer.drain()
+            log_request(client, method, target, response.status)
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def _serve_asyncio(app, address, workers, timeout, ready):
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(reader, writer, app, pool, timeout),
+        address[0] or None, address[1], reuse_address=True, limit=MAX_HEADER_BYTES)
+    try:
+        async with server:
+            if ready:
+                ready()
+            await server.serve_forever()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def serve_asyncio(app, address, workers=DEFAULT_WORKERS, timeout=REQUEST_TIMEOUT, ready=None):
+    """Serve app until interrupted from a single event loop; app calls run on a bounded pool"""
+    asyncio.run(_serve_asyncio(app, address, workers, timeout, ready))
+
+def serve(engine, app, address, workers=DEFAULT_WORKERS, timeout=REQUEST_TIMEOUT, ready=None):
+    if engine == "asyncio":
+        serve_asyncio(app, address, workers, timeout, ready)
+    else:
+        serve_threaded(app, address, workers, timeout, ready)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Event Log
+Append-only activity log in SQLite (WAL) with time and type indexes, written by agents and scripts
+through a local Unix socket or this module's CLI
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+MAX_EVENTS = 50000     # oldest events beyond this are pruned
+PRUNE_EVERY = 100      # appends between prunes
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+MAX_LINE = 65536       # longest event accepted on the socket
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    source TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_type ON events (type, id);
+"""
+
+def _row(row):
+    id_, ts, type_, text, source, data = row
+    return {
+        "id": id_,
+        "ts": ts,
+        "time": datetime.fromtimestamp(ts).strftime("%H:%M"),
+        "type": type_,
+        "text": text,
+        "source": source,
+        "data": json.loads(data) if data else None
+    }
+
+class EventLog:
+    """Bounded event table; ids only grow, so `after=<id>` is a stable cursor"""
+
+    def __init__(self, path=":memory:", max_events=MAX_EVENTS):
+        self.path = str(path)
+        self.max_events = max_events
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._appends = 0
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def add_listener(self, listener):
+        """Call listener(event) after each append through this log"""
+        self.listeners.append(listener)
+
+    def append(self, type, text, source=None, data=None, ts=None):
+        """Record one event; returns it with its id"""
+        if not type or not isinstance(type, str) or not isinstance(text, str):
+            raise ValueError("events need a string type and text")
+        ts = time.time() if ts is None else float(ts)
+        encoded = json.dumps(data) if data is not None else None
+        with self._lock, self._db:
+            cursor = self._db.execute("INSERT INTO events (ts, type, text, source, data) VALUES (?, ?, ?, ?, ?)",
+                                      (ts, type, text, source, encoded))
+            event = _row((cursor.lastrowid, ts, type, text, source, encoded))
+            self._appends += 1
+            if self._appends % PRUNE_EVERY == 0:
+                self._db.execute("DELETE FROM events WHERE id <= ?", (cursor.lastrowid - self.max_events,))
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Event listener failed: {e}")
+        return event
+
+    def query(self, after=None, types=None, since=None, limit=DEFAULT_LIMIT):
+        """Events in id order: the first `limit` after the cursor, or the newest `limit` without one"""
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        clauses, params = [], []
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(int(after))
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params += list(types)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(float(since))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if after is not None else "DESC"
+        with self._lock:
+            rows = self._db.execute(f"SELECT id, ts, type, text, source, data FROM events {where} "
+                                    f"ORDER BY id {order} LIMIT ?", params + [limit + 1]).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if order == "DESC":
+            rows.reverse()
+        return [_row(row) for row in rows], more
+
+    def counts(self, since):
+        """{type: events} recorded since the given timestamp"""
+        with self._lock:
+            rows = self._db.execute("SELECT type, COUNT(*) FROM events WHERE ts >= ? GROUP BY type",
+                                    (float(since),)).fetchall()
+        return dict(rows)
+
+    def latest_id(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    """One JSON event per line in, one JSON reply ({"id": n} or {"error": ...}) per line out"""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_LINE)
+            if not line:
+                return
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                event = self.server.log.append(request.get("type"), request.get("text"),
+                                               request.get("source"), request.get("data"))
+                reply = {"id": event["id"]}
+            except (ValueError, TypeError, AttributeError) as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+class SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Local-only write path: the socket file is owner-only, unlike the HTTP server on the LAN"""
+
+    daemon_threads = True
+
+    def __init__(self, path, log):
+        self.path = Path(path)
+        self.log = log
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.is_socket():
+            self.path.unlink()   # left over from a previous run
+        super().__init__(str(self.path), _SocketHandler)
+        os.chmod(self.path, 0o600)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="event-socket", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+def send(socket_path, event):
+    """Write one event through a running server's socket; returns its id"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(event).encode() + b"\n")
+        reply = json.loads(sock.makefile("rb").readline())
+    if "error" in reply:
+        raise ValueError(reply["error"])
+    return reply["id"]
+
+# Set by serve.py; collectors fall back to an empty list when no log is open
+current = None
+
+if __name__ == "__main__":
+    data_dir = Path(__file__).parent / "data"
+    parser = argparse.ArgumentParser(description="Digiclaw Event Log")
+    parser.add_argument("--socket", default=str(data_dir / "events.sock"), help="Running server's event socket")
+    parser.add_argument("--db", default=str(data_dir / "events.db"), help="Database used when no server is running")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Record an event")
+    add.add_argument("type", help="Event type, e.g. decision, maintenance, deploy")
+    add.add_argument("text", help="What happened")
+    add.add_argument("--source", help="Who recorded it (agent or script name)")
+    add.add_argument("--data", help="Extra JSON payload")
+    tail = commands.add_parser("tail", help="Print recent events")
+    tail.add_argument("--type", action="append", help="Only this type (repeatable)")
+    tail.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "add":
+        event = {"type": args.type, "text": args.text, "source": args.source,
+                 "data": json.loads(args.data) if args.data else None}
+        try:
+            print(send(args.socket, event))
+        except OSError:
+            # No server listening - WAL lets us write alongside a reader safely
+            log = EventLog(args.db)
+            print(log.append(**event)["id"])
+            log.close()
+    else:
+        log = EventLog(args.db)
+        events, _ = log.query(types=args.type, limit=args.limit)
+        for event in events:
+            print(f"{event['id']:>6} {datetime.fromtimestamp(event['ts']):%Y-%m-%d %H:%M:%S} "
+                  f"[{event['type']}] {event['text']}" + (f" ({event['source']})" if event["source"] else ""))
+        log.close()
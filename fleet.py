@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Fleet Aggregator
+Pulls every peer dashboard's snapshot concurrently over kept-alive connections and serves one merged fleet view
+"""
+
+import gzip
+import http.client
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import apicodec
+import pacing
+
+FETCH_INTERVAL = 5     # seconds between pulls of every peer
+FETCH_TIMEOUT = 3.0    # per-peer budget for the whole pull, connect to last byte
+STALE_AFTER = 3        # a peer missing this many intervals is reported stale
+MAX_WORKERS = 16
+
+class Peer:
+    """One remote dashboard, its pooled connection and the last snapshot it returned"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec["name"]
+        self.url = spec["url"].rstrip("/")
+        self.timeout = spec.get("timeout", FETCH_TIMEOUT)
+        parsed = urlparse(self.url)
+        self.https = parsed.scheme == "https"
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if self.https else 80)
+        self.base = parsed.path
+        self.connection = None
+        self.etag = None
+        self.snapshot = None     # peer's /api/status JSON bytes, embedded as-is
+        self.remote_version = None
+        self.last_ok = None
+        self.last_attempt = None
+        self.fetch_ms = None
+        self.error = None
+        self.busy = False        # a fetch is running (possibly past its deadline)
+        self._aborted = False
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def fetch(self):
+        """Pull /api/status, reusing the kept-alive connection; returns True when the snapshot changed"""
+        self.busy, self._aborted = True, False
+        try:
+            return self._fetch()
+        finally:
+            self.busy = False
+
+    def abort(self):
+        """Past its deadline: report the peer failing and break off the request in flight"""
+        self._aborted = True
+        self.error = f"timed out after {self.timeout}s"
+        connection = self.connection
+        if connection is not None and connection.sock is not None:
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _fetch(self):
+        started = time.perf_counter()
+        self.last_attempt = time.time()
+        headers = {"Accept-Encoding": "gzip", "User-Agent": pacing.POLLER_AGENT + "Fleet"}
+        if pacing.pacer.watched():
+            # Someone is watching the fleet here, so peers should collect at full speed too
+            headers[pacing.WATCHED_HEADER] = "1"
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        # One retry on a fresh connection covers a keep-alive the peer closed while idle
+        while True:
+            reused = self.connection is not None
+            if not reused:
+                self.connection = self._connect()
+            try:
+                self.connection.request("GET", self.base + "/api/status", headers=headers)
+                response = self.connection.getresponse()
+                body = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                if self._aborted:
+                    return False   # abort() already recorded the timeout
+                if not reused or isinstance(e, TimeoutError):
+                    self.error = str(e) or type(e).__name__
+                    return False
+        self.fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+        if response.status == 304:
+            self.last_ok, self.error = time.time(), None
+            return False
+        if response.status != 200:
+            self.error = f"HTTP {response.status}"
+            return False
+        try:
+            if response.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            self.remote_version = json.loads(body).get("version")
+        except (OSError, ValueError, AttributeError) as e:
+            self.error = f"Invalid snapshot: {e}"
+            return False
+        self.snapshot = body
+        self.etag = response.getheader("ETag")
+        self.last_ok, self.error = time.time(), None
+        return True
+
+    def state(self, now, interval):
+        if self.last_ok is None:
+            return "unreachable"
+        if now - self.last_ok > interval * STALE_AFTER:
+            return "stale"
+        return "online" if self.error is None else "failing"
+
+    def describe(self, now, interval):
+        """Host entry of the fleet view, minus the snapshot itself"""
+        return {
+            "url": self.url,
+            "state": self.state(now, interval),
+            "last_ok": round(self.last_ok, 3) if self.last_ok else None,
+            "fetch_ms": self.fetch_ms,
+            "error": self.error,
+            "remote_version": self.remote_version
+        }
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class FleetAggregator:
+    """Merges peer snapshots (and optionally our own) into one view, re-encoded only when a host changes"""
+
+    def __init__(self, interval=FETCH_INTERVAL):
+        self.interval = interval
+        self.local = None        # (name, callable returning (version, JSON bytes)) for this dashboard
+        self._lock = threading.Lock()
+        self._peers = {}
+        self._specs = None
+        self._entries = {}       # host -> (encoded describe(), ETag) as last published
+        self.version = int(time.time() * 1000)
+        self._local_version = None
+        self._body = None
+        self._stop = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def configure(self, specs):
+        """Set the peers to pull (list of {name, url, timeout?}); unchanged peers keep their connection"""
+        specs = specs or []
+        with self._lock:
+            if specs == self._specs:
+                return self
+            self._specs = specs
+            peers = {}
+            for spec in specs:
+                current = self._peers.pop(spec["name"], None)
+                if current is not None and current.spec == spec:
+                    peers[spec["name"]] = current
+                else:
+                    if current is not None:
+                        current.close()
+                    peers[spec["name"]] = Peer(spec)
+            for removed in self._peers.values():
+                removed.close()
+            self._peers = peers
+            self._body = None
+        return self
+
+    @property
+    def enabled(self):
+        return bool(self._peers)
+
+    def peer_names(self):
+        with self._lock:
+            return list(self._peers)
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fleet")
+        self._thread = threading.Thread(target=self._run, name="fleet-aggregator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        with self._lock:
+            for peer in self._peers.values():
+                peer.close()
+
+    def pull(self):
+        """Fetch every peer at once; a peer still going after its timeout is aborted and reported failing"""
+        with self._lock:
+            # A peer whose aborted fetch has not unwound yet sits this round out
+            peers = [peer for peer in self._peers.values() if not peer.busy]
+        if not peers:
+            return
+        if self._executor is None:
+            for peer in peers:
+                peer.fetch()
+        else:
+            started = time.monotonic()
+            pending = {self._executor.submit(peer.fetch): peer for peer in peers}
+            while pending:
+                deadline = started + min(peer.timeout for peer in pending.values())
+                done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0))
+                for future in done:
+                    del pending[future]
+                now = time.monotonic()
+                for future, peer in list(pending.items()):
+                    if now - started >= peer.timeout:
+                        peer.abort()
+                        del pending[future]
+        with self._lock:
+            self._update()
+
+    def _update(self):
+        """Bump the fleet version when any host's entry changed since the last pull
+
+        last_ok moves on every successful pull, so the version ticks at most once per interval.
+        """
+        now = time.time()
+        changed = False
+        for name, peer in self._peers.items():
+            entry = (apicodec.dumps(peer.describe(now, self.interval)), peer.etag)
+            if self._entries.get(name) != entry:
+                self._entries[name] = entry
+                changed = True
+        for name in list(self._entries):
+            if name not in self._peers:
+                del self._entries[name]
+                changed = True
+        if changed:
+            self.version += 1
+            self._body = None
+
+    def render(self):
+        """(version, fleet JSON) - composed from each host's last bytes once per version"""
+        local = None
+        if self.local is not None:
+            name, read = self.local
+            local_version, local_body = read()
+            local = (name, local_version, local_body)
+        with self._lock:
+            if local is not None and local[1] != self._local_version:
+                self._local_version = local[1]
+                self.version += 1
+                self._body = None
+            if self._body is None:
+                self._body = self._compose(local)
+            return self.version, self._body
+
+    def _compose(self, local):
+        now = time.time()
+        hosts = []
+        if local is not None:
+            name, version, body = local
+            if name in self._peers:
+                name += " (local)"   # a peer shares our hostname - keep both entries
+            meta = {"url": None, "state": "local", "last_ok": round(now, 3), "fetch_ms": 0,
+                    "error": None, "remote_version": version}
+            hosts.append(_host(name, meta, body))
+        for name, peer in self._peers.items():
+            hosts.append(_host(name, peer.describe(now, self.interval), peer.snapshot))
+        return (b'{"timestamp": ' + apicodec.dumps(now) + b', "version": %d, "interval": %d, "hosts": {'
+                % (self.version, self.interval) + b", ".join(hosts) + b"}}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.pull()
+            except Exception as e:
+                print(f"Fleet pull failed: {e}")
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0.1))
+
+def _host(name, meta, snapshot):
+    """One host entry: the peer's snapshot bytes spliced in next to its fetch state"""
+    encoded = apicodec.dumps(meta)
+    return (apicodec.dumps(name) + b": " + encoded[:-1] + b', "snapshot": ' + (snapshot or b"null") + b"}")
+
+# Shared by serve.py (/api/fleet) - configured from the "peers" setting or --peer
+aggregator = FleetAggregator()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Metric History
+Fixed-size in-memory ring buffers with 1-minute and 1-hour rollups - memory use never grows
+"""
+
+import math
+import threading
+import time
+from array import array
+
+METRICS = {
+    "cpu": "%",
+    "memory": "%",
+    "disk": "%",
+    "load": "",
+    "latency": "ms"
+}
+
+# name, seconds per point (0 = every raw sample), capacity
+TIERS = (
+    ("raw", 0, 720),       # ~1 hour at the 5s system interval
+    ("minute", 60, 1440),  # 24 hours
+    ("hour", 3600, 720)    # 30 days
+)
+
+DEFAULT_SAMPLE_INTERVAL = 5
+
+RANGES = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+MAX_RANGE = 365 * 86400   # longest range accepted - far beyond any retention
+
+NAN = float("nan")
+
+class Ring:
+    """One tier: a timestamp array plus one float array per metric, overwritten in a circle"""
+
+    def __init__(self, name, step, capacity):
+        self.name = name
+        self.step = step
+        self.capacity = capacity
+        self.times = array('d', [0.0]) * capacity
+        self.values = {metric: array('f', [NAN]) * capacity for metric in METRICS}
+        self.head = 0
+        self.count = 0
+
+    def append(self, ts, values):
+        i = self.head
+        self.times[i] = ts
+        for metric, column in self.values.items():
+            column[i] = values.get(metric, NAN)
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def span(self):
+        """Seconds of history this tier can hold"""
+        return self.step * self.capacity
+
+    def points(self, metric, since):
+        column = self.values[metric]
+        start = (self.head - self.count) % self.capacity
+        points = []
+        for k in range(self.count):
+            j = (start + k) % self.capacity
+            ts = self.times[j]
+            if ts >= since:
+                value = column[j]
+                points.append([round(ts, 1), None if math.isnan(value) else round(value, 2)])
+        return points
+
+class Rollup:
+    """Averages samples into fixed buckets, handing back each bucket once it is complete"""
+
+    def __init__(self, step):
+        self.step = step
+        self.bucket = None
+        self.sums = {}
+        self.counts = {}
+
+    def add(self, ts, values):
+        bucket = ts - ts % self.step
+        completed = None
+        if self.bucket is not None and bucket != self.bucket:
+            completed = (self.bucket, {metric: self.sums[metric] / self.counts[metric]
+                                       for metric in self.sums if self.counts[metric]})
+            self.sums = {}
+            self.counts = {}
+        self.bucket = bucket
+        for metric, value in values.items():
+            if value is not None and not math.isnan(value):
+                self.sums[metric] = self.sums.get(metric, 0.0) + value
+                self.counts[metric] = self.counts.get(metric, 0) + 1
+        return completed
+
+class History:
+    """Raw samples cascade into minute and hour tiers as each bucket closes"""
+
+    def __init__(self, tiers=TIERS):
+        self.tiers = [Ring(name, step, capacity) for name, step, capacity in tiers]
+        self.rollups = [Rollup(ring.step) for ring in self.tiers[1:]]
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self.sinks = []
+
+    def record_latency(self, ms):
+        """Request latency, averaged into the next system sample"""
+        with self._lock:
+            self._latency_sum += ms
+            self._latency_count += 1
+
+    def record(self, values, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            values = dict(values)
+            if self._latency_count:
+                values["latency"] = self._latency_sum / self._latency_count
+                self._latency_sum = 0.0
+                self._latency_count = 0
+            self.tiers[0].append(ts, values)
+            sample = (ts, values)
+            for ring, rollup in zip(self.tiers[1:], self.rollups):
+                completed = rollup.add(ts, values)
+                if not completed:
+                    break
+                ts, values = completed
+                ring.append(ts, values)
+        for sink in self.sinks:
+            try:
+                sink(*sample)
+            except Exception as e:
+                print(f"Metric history sink failed: {e}")
+
+    def record_system(self, system):
+        """Take a sample from a get_system_metrics() result"""
+        if "error" in system:
+            return
+        disks = [disk for disk in system.get("disks", []) if "error" not in disk]
+        self.record({
+            "cpu": system["cpu"]["percent"],
+            "memory": system["memory"]["used_percent"],
+            "disk": disks[0]["used_percent"] if disks else NAN,
+            "load": system["load"]["1m"]
+        })
+
+    def query(self, metric, seconds):
+        """Points covering the last `seconds`, from the finest tier that spans that range"""
+        with self._lock:
+            raw = self.tiers[0]
+            ring = raw
+            for tier in self.tiers[1:]:
+                covered = ring.span() if ring.step else self._raw_span(raw)
+                if seconds <= covered:
+                    break
+                ring = tier
+            return {
+                "metric": metric,
+                "unit": METRICS[metric],
+                "range": seconds,
+                "resolution": ring.name,
+                "points": ring.points(metric, time.time() - seconds)
+            }
+
+    def covers(self, seconds):
+        """Whether in-memory history reaches back `seconds` (it starts empty on every restart)"""
+        return time.time() - self.started >= seconds
+
+    def mean(self, metric, seconds):
+        """Average of the raw tier over the last `seconds`, or None without samples"""
+        values = [value for _, value in self.query(metric, min(seconds, 3600))["points"] if value is not None]
+        return sum(values) / len(values) if values else None
+
+    def _raw_span(self, raw):
+        """Span the raw tier holds when full, estimated from its sampling cadence"""
+        if raw.count < 2:
+            return raw.capacity * DEFAULT_SAMPLE_INTERVAL
+        start = (raw.head - raw.count) % raw.capacity
+        last = raw.times[(raw.head - 1) % raw.capacity]
+        return (last - raw.times[start]) / (raw.count - 1) * raw.capacity
+
+def parse_range(text):
+    """'15m', '24h', '7d' or plain seconds -> seconds; ValueError unless positive and at most a year"""
+    text = (text or "1h").strip().lower()
+    if text[-1:] in RANGES:
+        seconds = float(text[:-1]) * RANGES[text[-1]]
+    else:
+        seconds = float(text)
+    if not 0 < seconds <= MAX_RANGE:   # also rejects nan and inf
+        raise ValueError(f"range out of bounds: {text}")
+    return seconds
+
+store = History()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Server Instrumentation
+Request latency histograms, in-flight and byte counters, collector durations - rendered as Prometheus text
+"""
+
+import bisect
+import threading
+import time
+
+# Upper bounds in seconds, as Prometheus histograms expect
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COLLECTOR_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds observations in (buckets[i-1], buckets[i]]"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate by linear interpolation within the bucket holding the q-th observation"""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+class Metrics:
+    """Server-wide counters, safe to update from every engine's threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.in_flight = 0
+        self.latency = {}      # endpoint -> Histogram
+        self.requests = {}     # (endpoint, status) -> count
+        self.bytes_sent = {}   # endpoint -> bytes
+        self.collectors = {}   # collector -> Histogram
+        self.collector_last = {}
+        self.collector_stale = {}
+        self.gauges = {}       # name -> (help, callable)
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint, status, seconds, sent):
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            self.requests[(endpoint, status)] = self.requests.get((endpoint, status), 0) + 1
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + sent
+
+    def collector_run(self, name, seconds, stale=False):
+        with self._lock:
+            if stale:
+                self.collector_stale[name] = self.collector_stale.get(name, 0) + 1
+                return
+            histogram = self.collectors.get(name)
+            if histogram is None:
+                histogram = self.collectors[name] = Histogram(COLLECTOR_BUCKETS)
+            histogram.observe(seconds)
+            self.collector_last[name] = seconds
+
+    def gauge(self, name, help_text, read):
+        """Report read() under name at scrape time"""
+        self.gauges[name] = (help_text, read)
+
+    def summary(self):
+        """Headline numbers for the performance section"""
+        with self._lock:
+            overall = Histogram(LATENCY_BUCKETS)
+            for histogram in self.latency.values():
+                overall.counts = [a + b for a, b in zip(overall.counts, histogram.counts)]
+                overall.total += histogram.total
+                overall.sum += histogram.sum
+            slowest = sorted(self.collector_last.items(), key=lambda item: -item[1])[:3]
+            return {
+                "requests": overall.total,
+                "in_flight": self.in_flight,
+                "bytes_sent": sum(self.bytes_sent.values()),
+                "latency_p50_ms": _ms(overall.quantile(0.5)),
+                "latency_p95_ms": _ms(overall.quantile(0.95)),
+                "latency_p99_ms": _ms(overall.quantile(0.99)),
+                "errors": sum(count for (_, status), count in self.requests.items() if status >= 500),
+                "slowest_collectors": {name: _ms(seconds) for name, seconds in slowest}
+            }
+
+    def render(self):
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        with self._lock:
+            _help(lines, "digiclaw_http_requests_in_flight", "gauge", "Requests currently being handled")
+            lines.append(f"digiclaw_http_requests_in_flight {self.in_flight}")
+            _help(lines, "digiclaw_http_requests_total", "counter", "Requests handled by endpoint and status")
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'digiclaw_http_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            _help(lines, "digiclaw_http_response_bytes_total", "counter", "Response body bytes by endpoint")
+            for endpoint, sent in sorted(self.bytes_sent.items()):
+                lines.append(f'digiclaw_http_response_bytes_total{{endpoint="{endpoint}"}} {sent}')
+            _help(lines, "digiclaw_http_request_duration_seconds", "histogram", "Request handling time by endpoint")
+            for endpoint, histogram in sorted(self.latency.items()):
+                _histogram(lines, "digiclaw_http_request_duration_seconds", f'endpoint="{endpoint}"', histogram)
+            _help(lines, "digiclaw_collector_duration_seconds", "histogram", "Status collector run time")
+            for name, histogram in sorted(self.collectors.items()):
+                _histogram(lines, "digiclaw_collector_duration_seconds", f'collector="{name}"', histogram)
+            _help(lines, "digiclaw_collector_stale_total", "counter", "Collector runs that missed their deadline")
+            for name, count in sorted(self.collector_stale.items()):
+                lines.append(f'digiclaw_collector_stale_total{{collector="{name}"}} {count}')
+            gauges = list(self.gauges.items())
+        for name, (help_text, read) in gauges:
+            try:
+                value = read()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            _help(lines, name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+        _help(lines, "digiclaw_start_time_seconds", "gauge", "Server start time since the epoch")
+        lines.append(f"digiclaw_start_time_seconds {self.started:.0f}")
+        return ("\n".join(lines) + "\n").encode()
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def _help(lines, name, kind, text):
+    lines.append(f"# HELP {name} {text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+def _histogram(lines, name, labels, histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.total}")
+
+# Shared by serve.py (requests) and api.py (performance section)
+registry = Metrics()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Persistent Metric Store
+Append-only fixed-size records in daily segment files, read back through mmap
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from history import METRICS
+
+MAGIC = b"DCLWMET1"
+HEADER = struct.Struct("<8sII")                      # magic, record size, seconds per record (0 = raw)
+RECORD = struct.Struct("<d" + "f" * len(METRICS) + "I")  # timestamp, one float per metric, crc32
+METRIC_NAMES = list(METRICS)
+
+RAW_DAYS = 2          # days kept at full resolution before compacting to 1-minute averages
+RETENTION_DAYS = 30   # segments older than this are deleted
+FSYNC_INTERVAL = 60   # seconds between fsyncs of the open segment
+MAX_POINTS = 1000     # longer ranges are averaged down to about this many points
+
+NAN = float("nan")
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d")
+
+def _pack(ts, values):
+    fields = [values.get(metric, NAN) for metric in METRIC_NAMES]
+    body = struct.pack("<d" + "f" * len(fields), ts, *fields)
+    return body + struct.pack("<I", zlib.crc32(body))
+
+def _valid(record):
+    return zlib.crc32(record[:-4]) == struct.unpack_from("<I", record, len(record) - 4)[0]
+
+def recover_segment(path):
+    """Drop a torn or corrupt tail (e.g. after power loss) so the file ends on a whole good record"""
+    size = path.stat().st_size
+    if size < HEADER.size:
+        path.unlink()
+        return 0
+    with open(path, "r+b") as f:
+        magic, record_size, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path.name} is not a metric segment")
+        end = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+        while end > HEADER.size:
+            f.seek(end - RECORD.size)
+            if _valid(f.read(RECORD.size)):
+                break
+            end -= RECORD.size
+        if end != size:
+            f.truncate(end)
+    return size - end
+
+class Segment:
+    """Read-only mmap view over one segment file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.step = 0
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = max(size - HEADER.size, 0) // RECORD.size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._map:
+            _, _, self.step = HEADER.unpack_from(self._map, 0)
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        self._file.close()
+
+    def timestamp(self, i):
+        return struct.unpack_from("<d", self._map, HEADER.size + i * RECORD.size)[0]
+
+    def bisect(self, ts):
+        """Index of the first record at or after ts - records are appended in time order"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def records(self, since, until):
+        if not self.count:
+            return
+        for i in range(self.bisect(since), self.count):
+            record = RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+            if record[0] > until:
+                break
+            yield record[0], dict(zip(METRIC_NAMES, record[1:-1]))
+
+class MetricStore:
+    """Daily segments: today's raw file is appended to, older days are compacted and expired"""
+
+    def __init__(self, directory, raw_days=RAW_DAYS, retention_days=RETENTION_DAYS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.raw_days = raw_days
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._file = None
+        self._file_day = None
+        self._last_sync = 0
+        self.recovered_bytes = 0
+        for path in self.directory.glob("*.bin"):
+            try:
+                self.recovered_bytes += recover_segment(path)
+            except (OSError, ValueError) as e:
+                print(f"Skipping metric segment {path.name}: {e}")
+
+    def append(self, ts, values):
+        """Write one raw sample to today's segment"""
+        with self._lock:
+            day = _day(ts)
+            if day != self._file_day:
+                self._open(day)
+            self._file.write(_pack(ts, values))
+            self._file.flush()
+            if time.monotonic() - self._last_sync >= FSYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._last_sync = time.monotonic()
+
+    def _open(self, day):
+        if self._file:
+            self._file.close()
+        path = self.directory / f"{day}.bin"
+        new = not path.exists() or path.stat().st_size == 0
+        self._file = open(path, "ab")
+        if new:
+            self._file.write(HEADER.pack(MAGIC, RECORD.size, 0))
+        self._file_day = day
+        # A new day closes the previous one, so older segments can be compacted now
+        self.maintain()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._file_day = None
+
+    def segments(self):
+        """{day: path}, preferring a raw segment over a compacted one for the same day"""
+        found = {}
+        for path in sorted(self.directory.glob("*.bin")):
+            day = path.name[:8]
+            if day in found and path.name.endswith(".1m.bin"):
+                continue
+            found[day] = path
+        return found
+
+    def maintain(self, now=None):
+        """Compact raw segments older than raw_days and delete segments past retention"""
+        now = time.time() if now is None else now
+        keep_raw = _day(now - self.raw_days * 86400)
+        keep_any = _day(now - self.retention_days * 86400)
+        for day, path in self.segments().items():
+            try:
+                if day < keep_any:
+                    for stale in self.directory.glob(f"{day}*.bin"):
+                        stale.unlink()
+                elif day < keep_raw and not path.name.endswith(".1m.bin") and day != self._file_day:
+                    self._compact(day, path)
+            except OSError as e:
+                print(f"Metric store maintenance failed for {path.name}: {e}")
+
+    def _compact(self, day, path):
+        target = self.directory / f"{day}.1m.bin"
+        tmp = target.with_suffix(".tmp")
+        segment = Segment(path)
+        try:
+            with open(tmp, "wb") as out:
+                out.write(HEADER.pack(MAGIC, RECORD.size, 60))
+                for ts, values in _average(segment.records(0, float("inf")), 60):
+                    out.write(_pack(ts, values))
+                out.flush()
+                os.fsync(out.fileno())
+        finally:
+            segment.close()
+        os.replace(tmp, target)
+        path.unlink()
+
+    def query(self, metric, since, until=None, max_points=MAX_POINTS):
+        """[[ts, value], ...] for metric between since and until, averaged down to about max_points"""
+        until = time.time() if until is None else until
+        first, last = _day(since), _day(until)
+        bucket = max((until - since) / max_points, 0)
+        points = []
+        for day, path in sorted(self.segments().items()):
+            if day < first or day > last:
+                continue
+            try:
+                segment = Segment(path)
+            except (OSError, ValueError):
+                continue
+            try:
+                for ts, values in _average(segment.records(since, until), bucket):
+                    value = values.get(metric, NAN)
+                    points.append([round(ts, 1), None if value != value else round(value, 2)])
+            finally:
+                segment.close()
+        return points
+
+def _average(records, step):
+    """Average (ts, values) records into step-second buckets"""
+    if step <= 0:
+        yield from records
+        return
+    bucket = None
+    sums = {}
+    counts = {}
+    for ts, values in records:
+        start = ts - ts % step
+        if bucket is not None and start != bucket:
+            yield bucket, {metric: sums[metric] / counts[metric] for metric in sums}
+            sums = {}
+            counts = {}
+        bucket = start
+        for metric, value in values.items():
+            if value == value:
+                sums[metric] = sums.get(metric, 0.0) + value
+                counts[metric] = counts.get(metric, 0) + 1
+    if bucket is not None:
+        yield bucket, {metric: sums[metric] / counts[metric] for metric in sums}
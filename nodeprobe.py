@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Node Liveness Prober
+Checks every configured node concurrently on a background asyncio loop - status reads never wait on the network
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+PROBE_INTERVAL = 15   # seconds between probes of an online node
+PROBE_TIMEOUT = 3.0   # seconds for a TCP connect / HTTP health check
+MAX_BACKOFF = 300     # offline nodes are retried at interval * 2^failures, capped here
+RTT_HISTORY = 60      # round-trip samples kept per node
+
+class Node:
+    """Probe settings and liveness state for one host"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec["name"]
+        self.host = spec["host"]
+        self.check = spec.get("check", "http" if "path" in spec else "tcp")
+        self.port = spec.get("port", 80 if self.check == "http" else 22)
+        self.path = spec.get("path", "/")
+        self.interval = spec.get("interval", PROBE_INTERVAL)
+        self.timeout = spec.get("timeout", PROBE_TIMEOUT)
+        self.status = "unknown"
+        self.last_seen = None
+        self.last_error = None
+        self.failures = 0
+        self.next_probe = 0.0
+        self.rtt = deque(maxlen=RTT_HISTORY)
+
+    def record(self, ok, rtt_ms, error, now):
+        changed = (self.status == "online") != ok or self.status == "unknown"
+        if ok:
+            self.status = "online"
+            self.last_seen = datetime.now()
+            self.last_error = None
+            self.failures = 0
+            self.rtt.append(round(rtt_ms, 1))
+            self.next_probe = now + self.interval
+        else:
+            self.status = "offline"
+            self.last_error = error
+            self.failures += 1
+            self.next_probe = now + min(self.interval * 2 ** self.failures, MAX_BACKOFF)
+        return changed
+
+    def describe(self, now):
+        return {
+            "status": self.status,
+            "label": self.spec.get("label", self.name),
+            "last_seen": self.last_seen.strftime("%H:%M") if self.last_seen else "unknown",
+            "last_seen_at": self.last_seen.isoformat(timespec="seconds") if self.last_seen else None,
+            "host": self.host,
+            "check": self.check,
+            "rtt_ms": self.rtt[-1] if self.rtt else None,
+            "rtt_history": list(self.rtt),
+            "failures": self.failures,
+            "error": self.last_error,
+            "next_probe_in": round(max(self.next_probe - now, 0), 1)
+        }
+
+async def probe_tcp(host, port, timeout):
+    """Round-trip time in ms of a TCP connect"""
+    started = time.perf_counter()
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    rtt_ms = (time.perf_counter() - started) * 1000
+    writer.close()
+    return rtt_ms
+
+async def probe_http(host, port, path, timeout):
+    """Round-trip time in ms of an HTTP GET that answers below 400"""
+    async def request():
+        started = time.perf_counter()
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError("not an HTTP response")
+        if int(parts[1]) >= 400:
+            raise ConnectionError(f"HTTP {int(parts[1])}")
+        return (time.perf_counter() - started) * 1000
+    return await asyncio.wait_for(request(), timeout)
+
+class NodeMonitor:
+    """Probes nodes on a private event loop thread; status() only reads the last results"""
+
+    def __init__(self):
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._nodes = {}
+        self._specs = None
+        self._loop = None
+        self._wake = None
+        self._task = None
+        self._thread = None
+
+    def configure(self, specs):
+        """Set the nodes to probe (list of {name, host, port?, check?, path?, interval?, timeout?})
+
+        Unchanged nodes keep their state; the probe thread starts on first use.
+        """
+        specs = specs or []
+        with self._lock:
+            if specs != self._specs:
+                self._specs = specs
+                self._nodes = {spec["name"]: (self._nodes[spec["name"]] if spec["name"] in self._nodes
+                                              and self._nodes[spec["name"]].spec == spec else Node(spec))
+                               for spec in specs}
+                if self._loop:
+                    self._loop.call_soon_threadsafe(self._wake.set)
+        if self._thread is None and specs:
+            self.start()
+        return self
+
+    def add_listener(self, listener):
+        """Call listener(names) when nodes go online or offline"""
+        self.listeners.append(listener)
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            return {name: node.describe(now) for name, node in self._nodes.items()}
+
+    def start(self):
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="node-prober", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._probe_forever())
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass  # stopped by stop()
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _probe_forever(self):
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                due = [node for node in self._nodes.values() if node.next_probe <= now]
+            if due:
+                try:
+                    await self.probe(due)
+                except Exception as e:
+                    print(f"Node probe round failed: {e}")
+            with self._lock:
+                upcoming = min((node.next_probe for node in self._nodes.values()), default=now + PROBE_INTERVAL)
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(upcoming - time.monotonic(), 0.05))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def probe(self, nodes):
+        """Probe nodes concurrently, each against its own timeout"""
+        results = await asyncio.gather(*(self._probe_one(node) for node in nodes))
+        now = time.monotonic()
+        changed = []
+        with self._lock:
+            for node, (ok, rtt_ms, error) in zip(nodes, results):
+                if node.record(ok, rtt_ms, error, now):
+                    changed.append(node.name)
+        if changed:
+            for listener in self.listeners:
+                try:
+                    listener(changed)
+                except Exception as e:
+                    print(f"Node listener failed: {e}")
+
+    async def _probe_one(self, node):
+        try:
+            if node.check == "http":
+                rtt_ms = await probe_http(node.host, node.port, node.path, node.timeout)
+            else:
+                rtt_ms = await probe_tcp(node.host, node.port, node.timeout)
+            return True, rtt_ms, None
+        except asyncio.TimeoutError:
+            return False, None, f"timed out after {node.timeout}s"
+        except (OSError, ConnectionError) as e:
+            return False, None, str(e) or type(e).__name__
+        except Exception as e:
+            # A bad spec (e.g. host "a..b", a non-numeric port) fails this node, not the probe loop
+            return False, None, f"{type(e).__name__}: {e}"
+
+# Shared by the nodes collector and serve.py
+monitor = NodeMonitor()
+
+if __name__ == "__main__":
+    # One round of probes: nodeprobe.py host:port [http://host:port/path ...]
+    specs = []
+    for target in sys.argv[1:]:
+        check = "http" if target.startswith("http://") else "tcp"
+        address, _, path = target[len("http://"):].partition("/") if check == "http" else (target, "", "")
+        host, _, port = address.rpartition(":")
+        specs.append({"name": target, "host": host, "port": int(port), "check": check, "path": "/" + path})
+    nodes = [Node(spec) for spec in specs]
+    asyncio.run(NodeMonitor().probe(nodes))
+    for node in nodes:
+        print(f"{node.name:<40} {node.status:<8} {node.rtt[-1] if node.rtt else '-':>8} ms  {node.last_error or ''}")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Collection Pacing
+Decides how hard the collectors work: full speed with viewers or moving metrics, a slow heartbeat
+when nobody is watching, and a low-CPU floor when the machine is loaded - and measures its own CPU
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+IDLE_AFTER = 120           # seconds with no viewer before dropping to the heartbeat
+IDLE_INTERVAL = 60         # idle: no section runs more often than this
+THROTTLED_INTERVAL = 120   # high load: nor this, and declared intervals are stretched
+THROTTLED_STRETCH = 4
+HIGH_LOAD = 1.5            # 1-minute load per CPU that turns on throttling...
+NORMAL_LOAD = 1.0          # ...and the level it must fall back under to turn it off
+CPU_SWING = 15.0           # percentage-point jumps between samples that count as "moving"
+MEMORY_SWING = 5.0
+VOLATILE_HOLD = 60         # seconds to stay at full speed after a swing
+SELF_CPU_WINDOW = 60       # seconds the dashboard's own CPU use is averaged over
+
+MODES = ("active", "idle", "throttled")
+
+# User-Agent prefix of our own pollers (fleet aggregator, DDNS monitor) - they do not count as viewers...
+POLLER_AGENT = "Digiclaw-"
+# ...unless they relay one: an aggregator whose fleet view is being watched sends this on its pulls
+WATCHED_HEADER = "X-Digiclaw-Watched"
+
+def is_poller(headers):
+    return (headers.get("User-Agent") or "").startswith(POLLER_AGENT) and not headers.get(WATCHED_HEADER)
+
+class Pacer:
+    """Current collection mode and the interval it implies for each section"""
+
+    def __init__(self, viewers=None):
+        self.viewers = viewers or (lambda: 0)   # connected stream viewers
+        self.listeners = []
+        self.mode = "active"
+        self.reason = "startup"
+        self.load_per_cpu = 0.0
+        self._lock = threading.Lock()
+        self._last_seen = time.monotonic()
+        self._volatile_until = 0.0
+        self._last_system = None
+        self._cpu_count = os.cpu_count() or 1
+        self._cpu_samples = deque()   # (monotonic, process CPU seconds)
+        self.sample_cpu()
+
+    def add_listener(self, listener):
+        """Call listener(mode) whenever the mode changes"""
+        self.listeners.append(listener)
+
+    def seen(self):
+        """A viewer asked for data - leave idle mode straight away"""
+        self._last_seen = time.monotonic()
+        if self.mode == "idle":
+            self.update()
+
+    def watched(self):
+        """Whether anyone is looking - stream viewers or API requests within IDLE_AFTER"""
+        return bool(self.viewers()) or time.monotonic() - self._last_seen < IDLE_AFTER
+
+    def observe(self, system):
+        """Stay at full speed for a while after CPU or memory move sharply"""
+        current = (system.get("cpu", {}).get("percent"), system.get("memory", {}).get("used_percent"))
+        previous, self._last_system = self._last_system, current
+        if previous is None or None in current or None in previous:
+            return
+        if abs(current[0] - previous[0]) >= CPU_SWING or abs(current[1] - previous[1]) >= MEMORY_SWING:
+            self._volatile_until = time.monotonic() + VOLATILE_HOLD
+
+    def update(self):
+        """Re-evaluate the mode; returns it"""
+        now = time.monotonic()
+        self.sample_cpu(now)
+        try:
+            self.load_per_cpu = os.getloadavg()[0] / self._cpu_count
+        except OSError:
+            self.load_per_cpu = 0.0
+        with self._lock:
+            previous = self.mode
+            if self.load_per_cpu >= HIGH_LOAD or (previous == "throttled" and self.load_per_cpu >= NORMAL_LOAD):
+                mode, reason = "throttled", f"load {self.load_per_cpu:.2f} per CPU"
+            elif self.viewers():
+                mode, reason = "active", "stream viewers connected"
+            elif now - self._last_seen < IDLE_AFTER:
+                mode, reason = "active", "recent API requests"
+            elif now < self._volatile_until:
+                mode, reason = "active", "metrics changing quickly"
+            else:
+                mode, reason = "idle", f"no viewers for {IDLE_AFTER}s"
+            self.mode, self.reason = mode, reason
+        if mode != previous:
+            print(f"🐢 Collection mode: {previous} -> {mode} ({reason})")
+            for listener in self.listeners:
+                try:
+                    listener(mode)
+                except Exception as e:
+                    print(f"Pacing listener failed: {e}")
+        return mode
+
+    def pace(self, interval):
+        """Seconds until a section with this base interval runs again, in the current mode"""
+        if self.mode == "idle":
+            return max(interval, IDLE_INTERVAL)
+        if self.mode == "throttled":
+            return max(interval * THROTTLED_STRETCH, THROTTLED_INTERVAL)
+        return interval
+
+    def sample_cpu(self, now=None):
+        """Record this process's CPU seconds (every thread, user + system)"""
+        now = time.monotonic() if now is None else now
+        times = os.times()
+        with self._lock:
+            self._cpu_samples.append((now, times.user + times.system))
+            while len(self._cpu_samples) > 2 and now - self._cpu_samples[1][0] >= SELF_CPU_WINDOW:
+                self._cpu_samples.popleft()
+
+    def self_cpu(self):
+        """(percent of one CPU, percent of the whole machine) used by the dashboard over the window"""
+        with self._lock:
+            if len(self._cpu_samples) < 2:
+                return None, None
+            (start, start_cpu), (end, end_cpu) = self._cpu_samples[0], self._cpu_samples[-1]
+        if end <= start:
+            return None, None
+        percent = (end_cpu - start_cpu) / (end - start) * 100
+        return round(percent, 2), round(percent / self._cpu_count, 2)
+
+    def describe(self):
+        one_cpu, machine = self.self_cpu()
+        times = os.times()
+        return {
+            "mode": self.mode,
+            "reason": self.reason,
+            "load_per_cpu": round(self.load_per_cpu, 2),
+            "viewers": self.viewers(),
+            "idle_for": round(time.monotonic() - self._last_seen),
+            "self_cpu_percent": one_cpu,
+            "self_cpu_machine_percent": machine,
+            "self_cpu_seconds": round(times.user + times.system, 2)
+        }
+
+# Shared by serve.py (which feeds it viewers and requests) and api.py (performance section)
+pacer = Pacer()
@@ -0,0 +1,27 @@
+"""
+🔥 Digiclaw crontab collector plugin
+Lists the dashboard user's crontab entries
+"""
+
+import subprocess
+
+def register(collector):
+    @collector("crontab", interval=300, cost="subprocess", timeout=5.0,
+               schema={"entries": int, "jobs": [{"schedule": str, "command": str}]})
+    def get_crontab():
+        """Scheduled jobs from `crontab -l`"""
+        try:
+            result = subprocess.run(["crontab", "-l"], capture_output=True, text=True, timeout=4)
+        except FileNotFoundError:
+            return {"error": "crontab not installed"}
+        if result.returncode != 0:
+            # crontab -l exits non-zero when the user has no crontab
+            return {"entries": 0, "jobs": []}
+        jobs = []
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#") or "=" in line.split(None, 1)[0]:
+                continue
+            fields = line.split(None, 1 if line.startswith("@") else 5)
+            jobs.append({"schedule": " ".join(fields[:-1]), "command": fields[-1]})
+        return {"entries": len(jobs), "jobs": jobs[:20]}
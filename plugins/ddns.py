@@ -0,0 +1,39 @@
+"""
+🔥 Digiclaw DDNS collector plugin
+Reports the last check written by `setup-ddns.py --monitor` - the network work happens there, not here
+"""
+
+import json
+import time
+from pathlib import Path
+
+STATUS_FILE = Path(__file__).resolve().parent.parent / "data" / "ddns-status.json"
+STALE_AFTER = 3   # missed monitor intervals before the result is reported stale
+
+def register(collector):
+    @collector("ddns", interval=30, cost="cheap",
+               schema={"monitor": str, "public_ip": (str, None), "local_working": bool, "external_working": bool})
+    def get_ddns_status():
+        """External access health from the DDNS monitor's status file"""
+        try:
+            with open(STATUS_FILE) as f:
+                status = json.load(f)
+        except FileNotFoundError:
+            return {"monitor": "not running", "public_ip": None, "local_working": False, "external_working": False}
+        except (OSError, ValueError) as e:
+            return {"error": f"Unreadable {STATUS_FILE.name}: {e}"}
+        age = time.time() - status.get("checked_at", 0)
+        result = {
+            "monitor": "stale" if age > status.get("interval", 60) * STALE_AFTER else "running",
+            "checked_ago": round(age),
+            "public_ip": status.get("public_ip"),
+            "full_domain": status.get("full_domain"),
+            "local_working": bool(status.get("local_working")),
+            "external_working": bool(status.get("external_working")),
+            "dns_matches": status.get("dns_matches"),
+            "external_latency_ms": status.get("external", {}).get("latency_ms")
+        }
+        # Only a real failure carries "error" - its mere presence marks the collector as failed
+        if status.get("error"):
+            result["error"] = status["error"]
+        return result
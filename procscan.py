@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Process Table Scanner
+One pass over the process table per scan, shared by every registered matcher
+"""
+
+import threading
+import time
+
+import psutil
+
+class ProcessScanner:
+    """Single-pass process scanner with a PID-keyed command line cache"""
+
+    def __init__(self):
+        self.matchers = {}
+        self._cache = {}  # pid -> (create_time, name, cmdline)
+        self._lock = threading.Lock()
+        self.last_scan = {}
+
+    def register(self, name, matcher):
+        """Register matcher(name, cmdline) -> bool under name, replacing any previous one"""
+        with self._lock:
+            self.matchers[name] = matcher
+
+    def unregister(self, name):
+        with self._lock:
+            self.matchers.pop(name, None)
+
+    def scan(self):
+        """Walk the process table once and return {matcher name: [process info]}"""
+        with self._lock:
+            started = time.perf_counter()
+            matches = {name: [] for name in self.matchers}
+            seen = set()
+            new = 0
+
+            for proc in psutil.process_iter(['pid', 'name', 'create_time']):
+                try:
+                    pid = proc.info['pid']
+                    create_time = proc.info['create_time']
+                    cached = self._cache.get(pid)
+                    # A PID is only re-read when it is new or has been reused by another process
+                    if cached is None or cached[0] != create_time:
+                        cached = (create_time, proc.info['name'], proc.cmdline())
+                        self._cache[pid] = cached
+                        new += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+                seen.add(pid)
+
+                _, name, cmdline = cached
+                for matcher_name, matcher in self.matchers.items():
+                    try:
+                        if matcher(name or "", cmdline):
+                            matches[matcher_name].append({
+                                "pid": pid,
+                                "name": name,
+                                "command": ' '.join(cmdline)[:100]
+                            })
+                    except Exception:
+                        pass
+
+            for pid in set(self._cache) - seen:
+                del self._cache[pid]
+
+            self.last_scan = {
+                "processes": len(seen),
+                "new": new,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            return matches
+
+scanner = ProcessScanner()
@@ -4,8 +4,6 @@
 Serves dashboard on local network for monitoring Digiclaw status
 """
 
-import http.server
-import socketserver
 import socket
 import webbrowser
 import json
@@ -14,9 +12,27 @@ import os
 from pathlib import Path
 import argparse
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs, unquote
 import importlib.util
 import sys
+import time
+import functools
+
+import config
+import apicodec
+import eventlog
+import fleet
+import history
+import metrics
+import nodeprobe
+import pacing
+import watcher
+from collector import SnapshotCollector
+from metricstore import MetricStore
+from staticcache import StaticCache, cache_control, parse_accept_encoding
+from stream import StreamHub, SSE_HEADERS, format_event
+from views import VIEWS
+from engines import ENGINES, DEFAULT_WORKERS, REQUEST_TIMEOUT, Response, text_response, serve
 
 def get_local_ip():
     """Get the local IP address"""
@@ -29,114 +45,517 @@ def get_local_ip():
     except Exception:
         return "localhost"
 
-def get_comprehensive_data():
-    """Get comprehensive status data"""
-    try:
-        # Load the API module
-        spec = importlib.util.spec_from_file_location("api", Path(__file__).parent / "api.py")
+API_PATH = Path(__file__).parent / "api.py"
+
+class ApiLoader:
+    """Loads api.py once; with hot reload, re-executes it only when its mtime changes"""
+
+    def __init__(self, path, hot_reload=False):
+        self.path = path
+        self.hot_reload = hot_reload
+        self.module = None
+        self.mtime = None
+        self.import_timings = {}
+
+    def __call__(self):
+        if self.module is not None:
+            if not self.hot_reload:
+                return self.module
+            try:
+                mtime = self.path.stat().st_mtime
+            except OSError:
+                return self.module
+            if mtime == self.mtime:
+                return self.module
+            try:
+                self._exec()
+                print(f"♻️  Reloaded {self.path.name}")
+            except Exception as e:
+                # Keep serving the last good module until the file is fixed
+                self.mtime = mtime
+                print(f"Error reloading {self.path.name}: {e}")
+            return self.module
+
+        if "psutil" not in sys.modules:
+            started = time.perf_counter()
+            importlib.import_module("psutil")
+            self.import_timings["psutil"] = (time.perf_counter() - started) * 1000
+        self._exec()
+        return self.module
+
+    def _exec(self):
+        mtime = self.path.stat().st_mtime
+        started = time.perf_counter()
+        spec = importlib.util.spec_from_file_location("api", self.path)
         api_module = importlib.util.module_from_spec(spec)
-        sys.modules["api"] = api_module
         spec.loader.exec_module(api_module)
-        
-        return api_module.get_comprehensive_status()
-    except Exception as e:
-        print(f"Error loading comprehensive data: {e}")
-        # Fallback to basic data
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "system": {"error": "Failed to load comprehensive data"},
-            "memory_summary": {"error": str(e)},
-            "current_activity": {"status": "Error loading status", "last_update": datetime.now().strftime("%H:%M:%S")},
-            "projects": [{"name": "Dashboard", "status": "Building comprehensive system", "progress": 50}],
-            "recent_conversations": ["Working on comprehensive dashboard"],
-            "autonomous_work": [{"action": "Building status system", "time": datetime.now().strftime("%H:%M")}],
-            "next_actions": [{"action": "Fix comprehensive data loading", "priority": "high"}]
+        self.import_timings[self.path.name] = (time.perf_counter() - started) * 1000
+        sys.modules["api"] = api_module
+        self.module = api_module
+        self.mtime = mtime
+
+api_loader = ApiLoader(API_PATH)
+
+def load_api_module():
+    """Load the status API module"""
+    return api_loader()
+
+def fallback_status(error):
+    """Basic status used when the API module cannot be loaded"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "system": {"error": "Failed to load comprehensive data"},
+        "memory_summary": {"error": str(error)},
+        "current_activity": {"status": "Error loading status", "last_update": datetime.now().strftime("%H:%M:%S")},
+        "projects": [{"name": "Dashboard", "status": "Building comprehensive system", "progress": 50}],
+        "recent_conversations": ["Working on comprehensive dashboard"],
+        "autonomous_work": [{"action": "Building status system", "time": datetime.now().strftime("%H:%M")}],
+        "next_actions": [{"action": "Fix comprehensive data loading", "priority": "high"}]
+    }
+
+collector = SnapshotCollector(load_api_module, fallback=fallback_status)
+
+def record_history(updated, status):
+    """Feed each fresh system sample into the metric history"""
+    if "system" in updated:
+        history.store.record_system(status.get("system", {}))
+
+collector.add_listener(record_history)
+
+def record_collector_timings(updated, status):
+    """Feed each collector run into the /api/metrics duration histograms"""
+    timings = status.get("collectors", {})
+    for section in updated:
+        if section in timings:
+            metrics.registry.collector_run(section, timings[section]["duration_ms"] / 1000,
+                                           stale=timings[section]["stale"])
+
+collector.add_listener(record_collector_timings)
+
+stream_hub = StreamHub()
+metrics.registry.gauge("digiclaw_stream_viewers", "Connected Server-Sent Events viewers", stream_hub.count)
+
+def stream_status(previous):
+    """Full snapshot for new viewers plus a delta since the last push for connected ones"""
+    version, full = VIEWS["status"].render(collector, ensure=False)
+    if previous is None:
+        return version, full, full
+    return version, collector.delta_bytes(previous)[1], full
+
+def stream_system(previous):
+    version, body = VIEWS["system"].render(collector, ensure=False)
+    return version, body, body
+
+# Stream view -> builds (version, event payload, replay payload) from the latest snapshot
+STREAM_VIEWS = {
+    "status": stream_status,
+    "system": stream_system
+}
+
+_stream_versions = {}
+
+def publish_snapshot(updated, status):
+    """Push the new snapshot to every connected viewer - encoded once per view"""
+    for view, build in STREAM_VIEWS.items():
+        version, payload, replay = build(_stream_versions.get(view))
+        if payload is None or version == _stream_versions.get(view):
+            continue
+        _stream_versions[view] = version
+        stream_hub.publish(view, format_event(view, payload, version),
+                           replay=format_event(view, replay, version))
+
+collector.add_listener(publish_snapshot)
+
+def pace_collection(updated, status):
+    """Re-evaluate the collection mode after every refresh"""
+    if "system" in updated:
+        pacing.pacer.observe(status.get("system", {}))
+    pacing.pacer.update()
+
+collector.add_listener(pace_collection)
+collector.pace = pacing.pacer.pace
+pacing.pacer.viewers = stream_hub.count
+pacing.pacer.add_listener(lambda mode: collector.reschedule())
+metrics.registry.gauge("digiclaw_self_cpu_percent", "Dashboard CPU use over the last minute, percent of one CPU",
+                       lambda: pacing.pacer.self_cpu()[0])
+metrics.registry.gauge("digiclaw_collection_mode", "Collection pacing: 0 active, 1 idle, 2 throttled",
+                       lambda: pacing.MODES.index(pacing.pacer.mode))
+
+metric_store = None
+
+event_socket = None
+
+def on_event(event):
+    """Show a newly logged event without waiting for the autonomous_work interval"""
+    collector.invalidate("autonomous_work")
+
+def open_event_log(data_dir, socket_path=None):
+    """Open the event log (in memory without a data dir) and its local write socket"""
+    global event_socket
+    log = eventlog.EventLog(Path(data_dir) / "events.db" if data_dir else ":memory:")
+    log.add_listener(on_event)
+    eventlog.current = log
+    if socket_path is None and data_dir:
+        socket_path = Path(data_dir) / "events.sock"
+    if socket_path:
+        try:
+            event_socket = eventlog.SocketServer(socket_path, log).start()
+            print(f"📝 Event socket: {socket_path}")
+        except OSError as e:
+            print(f"Event socket unavailable ({socket_path}): {e}")
+    return log
+
+def on_workspace_change(changes):
+    """Re-collect the workspace sections as soon as files change instead of on their interval"""
+    collector.invalidate("projects", "workspace_changes")
+
+def on_node_change(names):
+    """Push node up/down transitions without waiting for the nodes interval"""
+    collector.invalidate("nodes")
+
+nodeprobe.monitor.add_listener(on_node_change)
+
+def start_watcher(use_inotify=True):
+    """Index the workspace in memory so collectors stop globbing it"""
+    api = load_api_module()
+    index = watcher.WorkspaceWatcher(config.get("workspace"), api.WORKSPACE_FILE_SETS,
+                                     tree=api.DASHBOARD_TREE)
+    index.add_listener(on_workspace_change)
+    watcher.current = index.start(use_inotify)
+    print(f"👀 Watching {index.root} ({index.backend})")
+
+def get_comprehensive_data():
+    """Get the latest comprehensive status snapshot"""
+    return collector.snapshot()
+
+def print_startup_report(started):
+    """Show where cold start time went - module imports and the first collection pass"""
+    print("⏱️  Startup report")
+    for name, ms in api_loader.import_timings.items():
+        print(f"   import {name:<22} {ms:8.1f} ms")
+    for section, ms in sorted(collector.timings.items(), key=lambda item: -item[1]):
+        print(f"   collect {section:<21} {ms:8.1f} ms")
+    print(f"   total{'':<24} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    print(f"   json backend: {apicodec.JSON_BACKEND}, msgpack: {'yes' if apicodec.msgpack else 'no'}")
+
+DASHBOARD_DIR = Path(__file__).parent.resolve()
+DEFAULT_DATA_DIR = DASHBOARD_DIR / "data"
+
+NO_CACHE_HEADERS = [
+    ("Cache-Control", "no-cache, no-store, must-revalidate"),
+    ("Pragma", "no-cache"),
+    ("Expires", "0")
+]
+
+def json_response(body, etag=None, request_headers=None, key=None, content_type="application/json"):
+    """API response for an already-encoded body, gzipped when the client accepts it
+    
+    key names what body encodes (e.g. ("status", version)) so its gzip is built once and
+    shared by every client; without one the body is compressed per request.
+    """
+    headers = [("Content-type", content_type), ("Access-Control-Allow-Origin", "*"),
+               ("Vary", "Accept-Encoding")]
+    if (request_headers is not None and len(body) >= apicodec.MIN_COMPRESS_BYTES
+            and "gzip" in parse_accept_encoding(request_headers.get("Accept-Encoding"))):
+        body = apicodec.cache.gzip(key, body)
+        headers.append(("Content-Encoding", "gzip"))
+        etag = etag and etag[:-1] + '-gzip"'
+    if etag:
+        headers.append(("ETag", etag))
+    return Response(200, body, headers + NO_CACHE_HEADERS)
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match against a version ETag, whichever encoding the client cached"""
+    return bool(if_none_match) and etag in [tag.strip().replace("-gzip", "") for tag in if_none_match.split(",")]
+
+def not_modified(etag):
+    return Response(304, b"", [("ETag", etag), ("Access-Control-Allow-Origin", "*"),
+                               ("Vary", "Accept-Encoding")] + NO_CACHE_HEADERS)
+
+def api_status(query, headers):
+    """API endpoint for comprehensive status
+    
+    ?since=<version> returns only the sections changed after that version (or 304), and
+    If-None-Match with the current ETag returns 304.
+    """
+    since = query.get("since", [None])[0]
+    if since is None:
+        version, body = VIEWS["status"].render(collector)
+        key = ("status", version)
+    else:
+        try:
+            since = int(since)
+        except ValueError:
+            return text_response(400, "since must be a snapshot version")
+        collector.ensure()
+        version, body = collector.delta_bytes(since)
+        key = ("status", version, since)
+    etag = f'"{version}"'
+    if body is None or etag_matches(headers.get("If-None-Match"), etag):
+        return not_modified(etag)
+    return json_response(body, etag, headers, key)
+
+def api_system(query, headers):
+    """Legacy endpoint for backwards compatibility - only the system and projects sections"""
+    version, body = VIEWS["system"].render(collector)
+    etag = f'"{version}"'
+    if etag_matches(headers.get("If-None-Match"), etag):
+        return not_modified(etag)
+    return json_response(body, etag, headers, ("system", version))
+
+def api_fleet(query, headers):
+    """Aggregator mode: this dashboard plus every peer's last snapshot, with per-host staleness"""
+    if not fleet.aggregator.enabled:
+        return text_response(404, "Aggregator mode is off - configure peers or pass --peer")
+    version, body = fleet.aggregator.render()
+    etag = f'"{version}"'
+    if etag_matches(headers.get("If-None-Match"), etag):
+        return not_modified(etag)
+    return json_response(body, etag, headers, ("fleet", version))
+
+def api_stream(query, headers):
+    """Server-Sent Events: /api/stream?view=status (default) or view=system for the legacy shape"""
+    view = query.get("view", ["status"])[0]
+    if view not in STREAM_VIEWS:
+        return text_response(400, f"Unknown view {view!r}")
+    if stream_hub.is_full():
+        return text_response(503, "Too many viewers")
+    return Response(200, headers=SSE_HEADERS, stream=functools.partial(stream_hub.subscribe, view))
+
+def api_events(query, headers):
+    """Event log page: /api/events?after=<id>&type=<type>[,<type>]&since=<epoch>&limit=50
+    
+    Without after, the newest limit events; with it, the oldest ones after that id. Either way
+    `next` is the cursor to pass as after on the following request.
+    """
+    if eventlog.current is None:
+        return text_response(503, "Event log is not open")
+    try:
+        after = query.get("after", [None])[0]
+        after = int(after) if after is not None else None
+        since = query.get("since", [None])[0]
+        since = float(since) if since is not None else None
+        limit = int(query.get("limit", [eventlog.DEFAULT_LIMIT])[0])
+    except ValueError:
+        return text_response(400, "after and limit must be integers, since a timestamp")
+    types = [name for value in query.get("type", []) for name in value.split(",") if name]
+    events, more = eventlog.current.query(after, types, since, limit)
+    result = {"events": events, "next": events[-1]["id"] if events else (after or 0), "more": more}
+    return json_response(apicodec.dumps(result), request_headers=headers)
+
+def wants_msgpack(query, headers):
+    """?format=msgpack, or an Accept header asking for it when msgpack is installed"""
+    requested = query.get("format", [None])[0]
+    if requested is not None:
+        return requested == "msgpack"
+    accept = headers.get("Accept") or ""
+    return apicodec.msgpack is not None and ("application/msgpack" in accept or "application/x-msgpack" in accept)
+
+def api_history(query, headers):
+    """Time series for one metric: /api/history?metric=cpu&range=24h (&format=msgpack)"""
+    metric = query.get("metric", ["cpu"])[0]
+    if metric not in history.METRICS:
+        return Response(400, json.dumps({"error": f"Unknown metric {metric!r}",
+                                         "metrics": list(history.METRICS)}).encode(),
+                        [("Content-type", "application/json")])
+    try:
+        seconds = history.parse_range(query.get("range", ["1h"])[0])
+    except ValueError:
+        return text_response(400, "Invalid range")
+    if metric_store and not history.store.covers(seconds):
+        # Older than this process - read the persistent store instead
+        result = {
+            "metric": metric,
+            "unit": history.METRICS[metric],
+            "range": seconds,
+            "resolution": "disk",
+            "points": metric_store.query(metric, time.time() - seconds)
         }
+    else:
+        result = history.store.query(metric, seconds)
+    if wants_msgpack(query, headers):
+        try:
+            return json_response(apicodec.packb(result), request_headers=headers, content_type="application/msgpack")
+        except RuntimeError as e:
+            return text_response(406, str(e))
+    return json_response(apicodec.dumps(result), request_headers=headers)
+
+def api_metrics(query, headers):
+    """Prometheus text exposition of request, collector and stream counters"""
+    return Response(200, metrics.registry.render(),
+                    [("Content-type", "text/plain; version=0.0.4; charset=utf-8")] + NO_CACHE_HEADERS)
+
+ROUTES = {
+    "/api/status": api_status,
+    "/api/system": api_system,
+    "/api/history": api_history,
+    "/api/stream": api_stream,
+    "/api/metrics": api_metrics,
+    "/api/fleet": api_fleet,
+    "/api/events": api_events
+}
+
+static_cache = StaticCache(DASHBOARD_DIR)
 
-def start_server(port=8080, open_browser=False):
+def serve_static(path, query, headers):
+    """Serve a file from the dashboard directory out of the in-memory asset cache"""
+    file_path = static_cache.resolve(unquote(path).lstrip("/"))
+    asset = static_cache.get(file_path) if file_path else None
+    if asset is None:
+        return text_response(404, "File not found")
+    encoding, body, etag = asset.variant(headers.get("Accept-Encoding"))
+    response_headers = [
+        ("Content-type", asset.content_type),
+        ("Cache-Control", cache_control(asset, query.get("v", [None])[0])),
+        ("ETag", etag),
+        ("Last-Modified", asset.last_modified),
+        ("Vary", "Accept-Encoding")
+    ]
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        fresh = asset.matches(if_none_match)
+    else:
+        fresh = headers.get("If-Modified-Since") == asset.last_modified
+    if fresh:
+        return Response(304, b"", response_headers[1:])
+    if encoding:
+        response_headers.append(("Content-Encoding", encoding))
+    return Response(200, body, response_headers)
+
+def handle_request(method, target, headers):
+    """Dashboard app shared by every server engine"""
+    started = time.perf_counter()
+    parsed_path = urlparse(target)
+    route = ROUTES.get(parsed_path.path)
+    # Static files share one label so arbitrary paths cannot grow the metric set
+    endpoint = parsed_path.path if route else "static"
+    response = None
+    metrics.registry.request_started()
+    try:
+        query = parse_qs(parsed_path.query)
+        if route:
+            if route is not api_metrics and not pacing.is_poller(headers):
+                # Someone is looking at data - metrics scrapes and our own pollers do not keep collection awake
+                pacing.pacer.seen()
+            response = route(query, headers)
+        else:
+            response = serve_static(parsed_path.path, query, headers)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        history.store.record_latency(elapsed * 1000)
+        sent = len(response.body) if response and method != "HEAD" else 0
+        metrics.registry.request_finished(endpoint, response.status if response else 500, elapsed, sent)
+
+def start_server(port=8080, bind="", open_browser=False, hot_reload=False, startup_report=False,
+                 engine="threaded", workers=DEFAULT_WORKERS, timeout=REQUEST_TIMEOUT,
+                 data_dir=DEFAULT_DATA_DIR, use_inotify=True, peers=None, event_socket_path=None):
     """Start the dashboard server"""
     
-    # Change to dashboard directory
-    dashboard_dir = Path(__file__).parent
+    global metric_store
     
-    class DigiclawHandler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory=str(dashboard_dir), **kwargs)
-        
-        def do_GET(self):
-            parsed_path = urlparse(self.path)
-            
-            # API endpoint for comprehensive status
-            if parsed_path.path == '/api/status':
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Pragma', 'no-cache') 
-                self.send_header('Expires', '0')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                status_data = get_comprehensive_data()
-                self.wfile.write(json.dumps(status_data).encode())
-                return
-                
-            # Legacy endpoint for backwards compatibility
-            if parsed_path.path == '/api/system':
-                self.send_response(200) 
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-                self.send_header('Pragma', 'no-cache')
-                self.send_header('Expires', '0')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                # Convert comprehensive data to legacy format
-                comprehensive = get_comprehensive_data()
-                legacy_data = {
-                    "memory": comprehensive.get("system", {}).get("memory_available", "Unknown"),
-                    "storage": comprehensive.get("system", {}).get("disk_free", "Unknown"),
-                    "activities": [{"time": datetime.now().strftime("%H:%M"), "text": "Comprehensive status system active"}],
-                    "projects": comprehensive.get("projects", [])
-                }
-                self.wfile.write(json.dumps(legacy_data).encode())
-                return
-            
-            # Serve static files
-            super().do_GET()
-        
-        def end_headers(self):
-            # Add headers for local network access
-            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            super().end_headers()
+    started = time.perf_counter()
+    api_loader.hot_reload = hot_reload
+    
+    if data_dir:
+        metric_store = MetricStore(Path(data_dir) / "metrics")
+        if metric_store.recovered_bytes:
+            print(f"🩹 Dropped {metric_store.recovered_bytes} bytes of torn metric records")
+        metric_store.maintain()
+        history.store.sinks.append(metric_store.append)
     
     # Get local IP for network access
     local_ip = get_local_ip()
     
-    with socketserver.TCPServer(("", port), DigiclawHandler) as httpd:
-        print(f"🔥 Digiclaw Dashboard Server Starting...")
+    open_event_log(data_dir, event_socket_path)
+    eventlog.current.append("server", f"Dashboard server started on port {port}", source="serve.py")
+    
+    start_watcher(use_inotify)
+    print(f"📡 Collecting initial status snapshot...")
+    stream_hub.start()
+    collector.start()
+    
+    fleet.aggregator.configure(peers if peers is not None else config.get("peers"))
+    if fleet.aggregator.enabled:
+        fleet.aggregator.local = (socket.gethostname(), collector.versioned_bytes)
+        fleet.aggregator.start()
+        print(f"🛰️  Aggregating {len(fleet.aggregator.peer_names())} peer dashboards every {fleet.aggregator.interval}s")
+    if startup_report:
+        print_startup_report(started)
+    
+    def ready():
+        print(f"🔥 Digiclaw Dashboard Server Starting ({engine} engine, {workers} workers)...")
         print(f"📍 Local access: http://localhost:{port}")
-        print(f"🌐 Network access: http://{local_ip}:{port}")
-        print(f"📊 API endpoint: http://{local_ip}:{port}/api/system")
-        print(f"📱 Pi access: http://192.168.2.X:{port}")
+        host = bind or local_ip
+        print(f"🌐 Network access: http://{host}:{port}")
+        print(f"📊 API endpoint: http://{host}:{port}/api/system")
+        print(f"📡 Live stream: http://{host}:{port}/api/stream")
+        if fleet.aggregator.enabled:
+            print(f"🛰️  Fleet view: http://{host}:{port}/api/fleet")
+        if not bind:
+            print(f"📱 Pi access: http://192.168.2.X:{port}")
         print(f"🛑 Press Ctrl+C to stop")
         print("-" * 50)
         
         if open_browser:
             webbrowser.open(f"http://localhost:{port}")
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print(f"\n🔥 Dashboard server stopped")
+    
+    try:
+        serve(engine, handle_request, (bind, port), workers=workers, timeout=timeout, ready=ready)
+    except KeyboardInterrupt:
+        print(f"\n🔥 Dashboard server stopped")
+    finally:
+        collector.stop()
+        fleet.aggregator.stop()
+        stream_hub.stop()
+        watcher.current.stop()
+        nodeprobe.monitor.stop()
+        if event_socket:
+            event_socket.stop()
+        eventlog.current.close()
+        if metric_store:
+            metric_store.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Digiclaw Dashboard Server")
     parser.add_argument("--port", "-p", type=int, default=8080, 
                        help="Port to serve on (default: 8080)")
+    parser.add_argument("--bind", default="", metavar="ADDRESS",
+                       help="Address to listen on, e.g. 127.0.0.1 (default: every interface)")
     parser.add_argument("--browser", "-b", action="store_true",
                        help="Open browser automatically")
+    parser.add_argument("--engine", choices=ENGINES, default="threaded",
+                       help="Server engine (default: threaded)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"Worker pool size (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                       help=f"Seconds a request may take before a 504, both engines (default: {REQUEST_TIMEOUT})")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR),
+                       help="Directory for persistent metric history (default: ./data)")
+    parser.add_argument("--no-persist", action="store_true",
+                       help="Keep metric history in memory only")
+    parser.add_argument("--event-socket",
+                       help="Unix socket for writing events (default: <data-dir>/events.sock)")
+    parser.add_argument("--no-inotify", action="store_true",
+                       help="Poll the workspace for changes instead of using inotify")
+    parser.add_argument("--peer", action="append", metavar="NAME=URL",
+                       help="Peer dashboard to aggregate into /api/fleet (repeatable; overrides the peers setting)")
+    parser.add_argument("--reload", action="store_true",
+                       help="Re-load api.py when it changes on disk")
+    parser.add_argument("--startup-report", action="store_true",
+                       help="Print import and first-collection timings at startup")
     
     args = parser.parse_args()
-    start_server(port=args.port, open_browser=args.browser)
\ No newline at end of file
+    peers = None
+    if args.peer:
+        peers = []
+        for peer in args.peer:
+            name, _, url = peer.partition("=")
+            if not url:
+                parser.error(f"--peer expects NAME=URL, got {peer!r}")
+            peers.append({"name": name, "url": url})
+    start_server(port=args.port, bind=args.bind, open_browser=args.browser,
+                 hot_reload=args.reload, startup_report=args.startup_report,
+                 engine=args.engine, workers=args.workers, timeout=args.timeout,
+                 data_dir=None if args.no_persist else args.data_dir,
+                 use_inotify=not args.no_inotify, peers=peers, event_socket_path=args.event_socket)
\ No newline at end of file
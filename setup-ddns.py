@@ -1,30 +1,110 @@
 #!/usr/bin/env python3
 """
 🔥 Digiclaw DDNS Setup for digiclaw.digized.xyz
-Automatically configures dynamic DNS to make dashboard accessible externally
+Automatically configures dynamic DNS to make dashboard accessible externally,
+and with --monitor keeps checking it for the dashboard's DDNS card
 """
 
-import subprocess
+import argparse
+import ipaddress
+import os
 import requests
 import socket
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+import eventlog
+import pacing
+
+DASHBOARD_DIR = Path(__file__).parent
+CONFIG_FILE = DASHBOARD_DIR / "ddns-config.json"
+STATUS_FILE = DASHBOARD_DIR / "data" / "ddns-status.json"   # read by plugins/ddns.py
+EVENT_SOCKET = DASHBOARD_DIR / "data" / "events.sock"
+
+# Asked all at once; the first valid answer wins
+IP_SOURCES = ["https://api.ipify.org?format=json", "https://icanhazip.com"]
+IP_TIMEOUT = 5
+IP_TTL = 300              # seconds a public IP answer is reused
+LOCAL_TIMEOUT = 3
+EXTERNAL_TIMEOUT = 5
+MONITOR_INTERVAL = 60
+
+def make_session(pool_size=4):
+    """Session whose kept-alive connections are reused by every lookup and check"""
+    session = requests.Session()
+    # Marks the local dashboard check as a poller, so it does not keep collection out of idle mode
+    session.headers["User-Agent"] = pacing.POLLER_AGENT + "DDNS"
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _ip_from(response):
+    """The IP in an ipify-style JSON or plain-text answer; raises ValueError otherwise"""
+    response.raise_for_status()
+    try:
+        text = response.json()["ip"]
+    except (ValueError, KeyError, TypeError):
+        text = response.text.strip()
+    return str(ipaddress.ip_address(text))
+
+class PublicIPCache:
+    """Public IP looked up from every source concurrently and reused for ttl seconds"""
+
+    def __init__(self, sources=None, ttl=IP_TTL, timeout=IP_TIMEOUT):
+        self.sources = list(sources or IP_SOURCES)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.ip = None
+        self.source = None
+        self.fetched = 0.0
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def get(self, session, pool):
+        """Cached IP while fresh; otherwise the first source to answer (None if all fail)"""
+        with self._lock:
+            if self.ip and time.monotonic() - self.fetched < self.ttl:
+                return self.ip
+            futures = {pool.submit(lambda url: _ip_from(session.get(url, timeout=self.timeout)), url): url
+                       for url in self.sources}
+            errors = {}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        ip = future.result()
+                    except (requests.RequestException, ValueError) as e:
+                        errors[futures[future]] = str(e)
+                        continue
+                    # Slower sources finish in the background; their answers are dropped
+                    self.ip, self.source, self.fetched, self.errors = ip, futures[future], time.monotonic(), errors
+                    return ip
+            self.errors = errors
+            for url, error in errors.items():
+                print(f"Failed to get public IP from {url}: {error}")
+            return self.ip   # last known IP, if any, beats none
+
+_session = None
+_pool = None
+_ip_cache = PublicIPCache()
+
+def _shared():
+    global _session, _pool
+    if _session is None:
+        _session = make_session()
+        _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ddns")
+    return _session, _pool
 
 def get_public_ip():
     """Get current public IP address"""
-    try:
-        response = requests.get('https://api.ipify.org?format=json', timeout=10)
-        return response.json()['ip']
-    except Exception as e:
-        print(f"Failed to get public IP: {e}")
-        try:
-            # Fallback method
-            response = requests.get('https://icanhazip.com', timeout=10)
-            return response.text.strip()
-        except Exception as e2:
-            print(f"Fallback IP detection failed: {e2}")
-            return None
+    session, pool = _shared()
+    return _ip_cache.get(session, pool)
 
 def get_local_ip():
     """Get local IP address"""
@@ -37,13 +117,17 @@ def get_local_ip():
     except Exception:
         return "192.168.2.22"  # Default based on known IP
 
-def setup_ddns_config():
-    """Setup DDNS configuration"""
+def setup_ddns_config(config_file=CONFIG_FILE):
+    """Setup DDNS configuration - the file is only rewritten when its contents change"""
     
-    public_ip = get_public_ip()
-    local_ip = get_local_ip()
+    config = build_config(get_public_ip(), get_local_ip())
+    save_if_changed(config, config_file)
+    return config
+
+def build_config(public_ip, local_ip):
+    """DDNS configuration and setup instructions for these addresses"""
     
-    config = {
+    return {
         "subdomain": "digiclaw",
         "domain": "digized.xyz",
         "full_domain": "digiclaw.digized.xyz",
@@ -78,13 +162,35 @@ def setup_ddns_config():
             ]
         }
     }
+
+def save_if_changed(config, path, ignore=("last_updated",)):
+    """Write config atomically unless only the ignored keys differ; returns whether it wrote
     
-    # Save config file
-    config_file = Path(__file__).parent / "ddns-config.json"
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
-    
-    return config
+    Unchanged runs keep the previous last_updated, so it records the last real change.
+    """
+    path = Path(path)
+    try:
+        with open(path) as f:
+            current = json.load(f)
+    except (OSError, ValueError):
+        current = None
+    if current is not None:
+        if {k: v for k, v in current.items() if k not in ignore} == {k: v for k, v in config.items() if k not in ignore}:
+            for key in ignore:
+                if key in current:
+                    config[key] = current[key]
+            return False
+    write_json(config, path)
+    return True
+
+def write_json(value, path):
+    """Replace path in one rename, so readers never see a half-written file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(value, f, indent=2)
+    os.replace(tmp, path)
 
 def print_setup_instructions(config):
     """Print setup instructions"""
@@ -117,33 +223,92 @@ def print_setup_instructions(config):
     print("   3. Test external: http://digiclaw.digized.xyz:8081/comprehensive.html") 
     print("   4. If external fails, check router port forwarding")
 
-def check_ddns_status(config):
-    """Check if DDNS is working"""
+def _check_url(session, url, timeout):
+    started = time.perf_counter()
+    try:
+        response = session.get(url, timeout=timeout)
+        return {"working": response.status_code == 200, "status_code": response.status_code,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+    except requests.RequestException as e:
+        return {"working": False, "error": str(e), "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+def _resolve(host):
+    try:
+        return sorted({info[4][0] for info in socket.getaddrinfo(host, None, socket.AF_INET)})
+    except OSError:
+        return []
+
+def check_ddns_status(config, session=None, pool=None, local_url=None, external_url=None):
+    """Check if DDNS is working - local, external and DNS checks run at the same time,
+    so a dead external route costs EXTERNAL_TIMEOUT rather than delaying everything after it"""
     
+    if session is None:
+        session, pool = _shared()
     try:
-        # Test local access
-        local_url = f"http://{config['local_ip']}:{config['dashboard_port']}/api/status"
-        response = requests.get(local_url, timeout=5)
-        local_working = response.status_code == 200
+        local_url = local_url or f"http://{config['local_ip']}:{config['dashboard_port']}/api/status"
+        # External access fails until DNS propagates and the router forwards the port
+        external_url = external_url or f"http://{config['full_domain']}:{config['dashboard_port']}/api/status"
+        local = pool.submit(_check_url, session, local_url, LOCAL_TIMEOUT)
+        external = pool.submit(_check_url, session, external_url, EXTERNAL_TIMEOUT)
+        resolved = pool.submit(_resolve, config['full_domain'])
+        local, external, resolved = local.result(), external.result(), resolved.result()
         
-        # Test external access (this will fail until DNS propagates)
-        external_url = f"http://{config['full_domain']}:{config['dashboard_port']}/api/status"
-        try:
-            response = requests.get(external_url, timeout=10)
-            external_working = response.status_code == 200
-        except:
-            external_working = False
-            
         return {
-            "local_working": local_working,
-            "external_working": external_working,
+            "local_working": local["working"],
+            "external_working": external["working"],
             "local_url": local_url,
-            "external_url": external_url
+            "external_url": external_url,
+            "local": local,
+            "external": external,
+            "dns_ips": resolved,
+            "dns_matches": config.get("public_ip") in resolved
         }
         
     except Exception as e:
         return {"error": str(e)}
 
+def monitor(args):
+    """Re-check every interval on one pooled session; rewrite files only when something changed"""
+    session = make_session()
+    pool = ThreadPoolExecutor(max_workers=len(args.ip_source or IP_SOURCES) + 3, thread_name_prefix="ddns")
+    ip_cache = PublicIPCache(args.ip_source, ttl=args.ip_ttl)
+    print(f"🔭 Monitoring DDNS every {args.interval}s (public IP cached for {args.ip_ttl}s)")
+    while True:
+        started = time.perf_counter()
+        previous_ip = ip_cache.ip
+        public_ip = ip_cache.get(session, pool)
+        config = build_config(public_ip, get_local_ip())
+        if public_ip:
+            save_if_changed(config, args.config)
+        status = check_ddns_status(config, session, pool, args.local_url, args.external_url)
+        status.update({
+            "public_ip": public_ip,
+            "ip_source": ip_cache.source,
+            "ip_errors": ip_cache.errors,
+            "full_domain": config["full_domain"],
+            "config_updated": config["last_updated"] if public_ip else None,
+            "interval": args.interval,
+            "checked_at": time.time(),
+            "check_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+        # Rewritten every check: checked_at is how the dashboard tells a live monitor from a dead one
+        write_json(status, args.status)
+        if previous_ip and public_ip != previous_ip:
+            _log_event(f"Public IP changed {previous_ip} → {public_ip} - update the {config['full_domain']} A record")
+        print(f"   {time.strftime('%H:%M:%S')} ip={public_ip} local={'✅' if status.get('local_working') else '❌'} "
+              f"external={'✅' if status.get('external_working') else '❌'} dns={'✅' if status.get('dns_matches') else '❌'} "
+              f"({status['check_ms']}ms)")
+        if args.once:
+            return status
+        time.sleep(max(args.interval - (time.perf_counter() - started), 1))
+
+def _log_event(text):
+    """Best effort - the dashboard may not be running"""
+    try:
+        eventlog.send(EVENT_SOCKET, {"type": "ddns", "text": text, "source": "setup-ddns.py"})
+    except (OSError, ValueError):
+        pass
+
 def main():
     """Main setup function"""
     
@@ -170,4 +335,23 @@ def main():
     print("   The comprehensive dashboard will then be accessible worldwide!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Digiclaw DDNS setup and monitor")
+    parser.add_argument("--monitor", action="store_true", help="Keep checking and feed the dashboard's DDNS card")
+    parser.add_argument("--once", action="store_true", help="With --monitor, run one check and exit")
+    parser.add_argument("--interval", type=float, default=MONITOR_INTERVAL,
+                        help=f"Seconds between checks (default: {MONITOR_INTERVAL})")
+    parser.add_argument("--ip-ttl", type=float, default=IP_TTL,
+                        help=f"Seconds to reuse a public IP answer (default: {IP_TTL})")
+    parser.add_argument("--ip-source", action="append", help="Public IP lookup URL (repeatable; replaces the defaults)")
+    parser.add_argument("--local-url", help="Override the local status URL to check")
+    parser.add_argument("--external-url", help="Override the external status URL to check")
+    parser.add_argument("--config", type=Path, default=CONFIG_FILE, help="DDNS config file")
+    parser.add_argument("--status", type=Path, default=STATUS_FILE, help="Status file the dashboard reads")
+    args = parser.parse_args()
+    if args.monitor:
+        try:
+            monitor(args)
+        except KeyboardInterrupt:
+            print("\n🔭 DDNS monitor stopped")
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Static Asset Cache
+Dashboard files held in memory with precompressed variants and content-hash ETags, reloaded when their mtime changes
+"""
+
+import email.utils
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Only dashboard assets are served - never sources, configs or the data directory's databases
+ASSET_SUFFIXES = {".html", ".css", ".js", ".svg", ".png", ".ico", ".webp", ".woff2"}
+MAX_ASSET_BYTES = 2 * 1024 * 1024
+
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_BYTES = 256
+
+# Assets referenced with ?v=<hash> never change under that URL; everything else revalidates
+VERSIONED_CACHE = "public, max-age=31536000, immutable"
+ASSET_CACHE = "public, max-age=300, must-revalidate"
+PAGE_CACHE = "no-cache"
+
+# href="style.css" / src="dashboard.js" in pages - rewritten to carry the asset's hash
+ASSET_REFERENCE = re.compile(rb'((?:href|src)=")([^":?#]+\.(?:css|js))(")')
+
+class Asset:
+    """One file's bytes, encodings and validators"""
+
+    def __init__(self, path, stamp, body, content_type, depends=None):
+        self.path = path
+        self.stamp = stamp
+        self.body = body
+        self.content_type = content_type
+        self.hash = hashlib.sha256(body).hexdigest()[:16]
+        self.etag = f'"{self.hash}"'
+        self.last_modified = email.utils.formatdate(stamp[0] / 1e9, usegmt=True)
+        self.depends = depends or {}
+        self.encodings = {}
+        if content_type.startswith(COMPRESSIBLE) and len(body) >= MIN_COMPRESS_BYTES:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.encodings["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.encodings["br"] = compressed
+
+    def variant(self, accept_encoding):
+        """(encoding or None, body, etag) for the client's Accept-Encoding - br preferred over gzip"""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and encoding in accepted:
+                return encoding, self.encodings[encoding], f'"{self.hash}-{encoding}"'
+        return None, self.body, self.etag
+
+    def matches(self, if_none_match):
+        """Whether If-None-Match names any representation of this content"""
+        for tag in (if_none_match or "").split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag[2:] if tag.startswith("W/") else tag
+            if tag.strip('"').split("-")[0] == self.hash:
+                return True
+        return False
+
+def parse_accept_encoding(header):
+    """Codings the client accepts (q > 0)"""
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class StaticCache:
+    """Path -> Asset under root; a stat per request replaces reading the file from disk"""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self._lock = threading.Lock()
+        self._assets = {}
+
+    def resolve(self, relative):
+        """Asset file under root for a URL path, or None for traversal, dotfiles and non-asset types"""
+        try:
+            file_path = (self.root / relative).resolve()
+            if file_path.is_dir():
+                file_path = file_path / "index.html"
+        except (OSError, ValueError):
+            return None   # e.g. an embedded NUL byte
+        if self.root not in file_path.parents:
+            return None
+        if any(part.startswith(".") for part in file_path.relative_to(self.root).parts):
+            return None
+        if file_path.suffix.lower() not in ASSET_SUFFIXES:
+            return None
+        return file_path
+
+    def get(self, file_path):
+        """Current Asset for file_path, re-read only when its mtime or size changed; None if missing or too big"""
+        try:
+            st = os.stat(file_path)
+            if st.st_size > MAX_ASSET_BYTES:
+                raise OSError("too large to cache")
+        except OSError:
+            with self._lock:
+                self._assets.pop(file_path, None)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            asset = self._assets.get(file_path)
+        if asset and asset.stamp == stamp and self._depends_current(asset):
+            return asset
+        asset = self._load(file_path, stamp)
+        with self._lock:
+            self._assets[file_path] = asset
+        return asset
+
+    def _depends_current(self, asset):
+        for path, digest in asset.depends.items():
+            current = self.get(path)
+            if (current.hash if current else None) != digest:
+                return False
+        return True
+
+    def _load(self, file_path, stamp):
+        body = file_path.read_bytes()
+        content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        depends = {}
+        if content_type == "text/html":
+            def versioned(match):
+                referenced = (file_path.parent / match.group(2).decode()).resolve()
+                asset = self.get(referenced) if self.root in referenced.parents else None
+                if asset is None:
+                    return match.group(0)
+                depends[referenced] = asset.hash
+                return match.group(1) + match.group(2) + b"?v=" + asset.hash.encode() + match.group(3)
+            body = ASSET_REFERENCE.sub(versioned, body)
+        return Asset(file_path, stamp, body, content_type, depends)
+
+def cache_control(asset, version):
+    """Long-lived for content-addressed URLs, short and revalidated for assets, always revalidated for pages"""
+    if version and version == asset.hash:
+        return VERSIONED_CACHE
+    if asset.content_type == "text/html":
+        return PAGE_CACHE
+    return ASSET_CACHE
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Server-Sent Events Hub
+Fans one encoded snapshot out to every connected viewer - N viewers cost one collection
+"""
+
+import queue
+import socket
+import threading
+
+HEARTBEAT_INTERVAL = 15   # seconds between keep-alive comments
+SEND_TIMEOUT = 1.0        # a viewer that cannot take an event this fast is dropped
+MAX_SUBSCRIBERS = 64
+WRITE_BUFFER_LIMIT = 256 * 1024
+QUEUE_LIMIT = 16          # events waiting for a slow viewer before it is dropped
+
+SSE_HEADERS = [
+    ("Content-Type", "text/event-stream"),
+    ("Cache-Control", "no-cache, no-store"),
+    ("X-Accel-Buffering", "no"),
+    ("Access-Control-Allow-Origin", "*")
+]
+
+def format_event(event, data, event_id=None):
+    """Encode one SSE message; data is already-serialized JSON bytes"""
+    head = f"event: {event}\n" + (f"id: {event_id}\n" if event_id is not None else "")
+    return head.encode() + b"data: " + data + b"\n\n"
+
+class SocketSubscriber:
+    """Viewer connection handed over by the threaded engine
+
+    send() only queues; one writer thread per viewer owns the socket, so frames never
+    interleave and a slow phone never blocks the thread that published.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.settimeout(SEND_TIMEOUT)
+        self.closed = False
+        self._queue = queue.Queue(QUEUE_LIMIT)
+        self._thread = threading.Thread(target=self._write, name="stream-writer", daemon=True)
+        self._thread.start()
+
+    def send(self, data):
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(data)
+            return True
+        except queue.Full:
+            return False
+
+    def _write(self):
+        while True:
+            data = self._queue.get()
+            if data is None or self.closed:
+                break
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                break
+        self.closed = True
+        self.sock.close()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass   # the writer fails on the shut-down socket and exits anyway
+
+class StreamWriterSubscriber:
+    """Viewer connection owned by the asyncio engine; writes are marshalled onto its loop"""
+
+    def __init__(self, loop, writer):
+        self.loop = loop
+        self.writer = writer
+
+    def send(self, data):
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+            return False
+        try:
+            self.loop.call_soon_threadsafe(self.writer.write, data)
+            return True
+        except RuntimeError:
+            return False
+
+    def close(self):
+        try:
+            self.loop.call_soon_threadsafe(self.writer.close)
+        except RuntimeError:
+            pass
+
+class StreamHub:
+    """Topic-keyed subscriber lists; the newest event per topic is replayed to new viewers"""
+
+    def __init__(self, max_subscribers=MAX_SUBSCRIBERS):
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._topics = {}
+        self._latest = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._heartbeat, name="stream-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            subscribers = [sub for subs in self._topics.values() for sub in subs]
+            self._topics = {}
+        for subscriber in subscribers:
+            subscriber.close()
+
+    def count(self, topic=None):
+        with self._lock:
+            if topic is not None:
+                return len(self._topics.get(topic, ()))
+            return sum(len(subs) for subs in self._topics.values())
+
+    def is_full(self):
+        return self.count() >= self.max_subscribers
+
+    def subscribe(self, topic, subscriber):
+        """Queue the latest event for its topic, then add the viewer - in one step, so a
+        concurrent publish can only ever arrive after the replay"""
+        with self._lock:
+            if not subscriber.send(b"retry: 3000\n\n" + (self._latest.get(topic) or b"")):
+                subscriber.close()
+                return
+            self._topics.setdefault(topic, []).append(subscriber)
+
+    def unsubscribe(self, topic, subscriber):
+        with self._lock:
+            subscribers = self._topics.get(topic, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+        subscriber.close()
+
+    def publish(self, topic, event, replay=None):
+        """Queue one pre-encoded event for every viewer of topic; replay (default: event) is kept for new viewers
+        
+        Subscriber sends never block, so this is safe to call from the collector thread.
+        """
+        with self._lock:
+            self._latest[topic] = replay or event
+            dropped = self._send_all(topic, event)
+        self._close(dropped)
+
+    def _send_all(self, topic, data):
+        """Queue data for each viewer of topic (lock held); returns the viewers that could not take it"""
+        subscribers = self._topics.get(topic, [])
+        dropped = [subscriber for subscriber in subscribers if not subscriber.send(data)]
+        for subscriber in dropped:
+            subscribers.remove(subscriber)
+        return dropped
+
+    def _close(self, subscribers):
+        for subscriber in subscribers:
+            subscriber.close()
+
+    def _heartbeat(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            with self._lock:
+                dropped = [subscriber for topic in list(self._topics)
+                           for subscriber in self._send_all(topic, b": ping\n\n")]
+            self._close(dropped)
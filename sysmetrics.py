@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Native System Metrics
+Reads /proc and statvfs directly - no subprocesses and no blocking CPU sample
+"""
+
+import os
+import threading
+import time
+
+class ProcFile:
+    """A /proc file kept open and re-read in place with pread"""
+
+    def __init__(self, path, size=8192):
+        self.path = path
+        self.size = size
+        self._fd = None
+
+    def read(self):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        try:
+            return os.pread(self._fd, self.size, 0).decode()
+        except OSError:
+            os.close(self._fd)
+            self._fd = None
+            raise
+
+_meminfo = ProcFile("/proc/meminfo")
+_loadavg = ProcFile("/proc/loadavg", 256)
+_uptime = ProcFile("/proc/uptime", 256)
+_stat = ProcFile("/proc/stat", 1024)
+
+_cpu_lock = threading.Lock()
+_cpu_last = None
+
+def human_size(num_bytes):
+    """Format bytes like df -h (e.g. 3.7G)"""
+    value = float(num_bytes)
+    for suffix in ("B", "K", "M", "G", "T"):
+        if value < 1024 or suffix == "T":
+            return f"{value:.1f}{suffix}" if suffix != "B" and value < 10 else f"{value:.0f}{suffix}"
+        value /= 1024
+
+def read_meminfo(keys=("MemTotal", "MemAvailable", "SwapTotal", "SwapFree")):
+    """Selected /proc/meminfo fields in kB, stopping once all are found"""
+    wanted = set(keys)
+    values = {}
+    for line in _meminfo.read().splitlines():
+        name, _, rest = line.partition(':')
+        if name in wanted:
+            values[name] = int(rest.split()[0])
+            if len(values) == len(wanted):
+                break
+    return values
+
+def read_loadavg():
+    parts = _loadavg.read().split()
+    return float(parts[0]), float(parts[1]), float(parts[2])
+
+def read_uptime():
+    return float(_uptime.read().split()[0])
+
+def _read_cpu_times():
+    fields = [int(value) for value in _stat.read().split('\n', 1)[0].split()[1:]]
+    # idle + iowait count as idle time
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return sum(fields[:8]), idle
+
+def cpu_percent(min_interval=0.1):
+    """CPU usage since the previous call, from /proc/stat deltas"""
+    global _cpu_last
+    with _cpu_lock:
+        if _cpu_last is None:
+            _cpu_last = _read_cpu_times()
+            time.sleep(min_interval)
+        total, idle = _read_cpu_times()
+        last_total, last_idle = _cpu_last
+        if total - last_total <= 0:
+            return 0.0
+        _cpu_last = (total, idle)
+        return 100.0 * (1 - (idle - last_idle) / (total - last_total))
+
+def disk_usage(mount):
+    """statvfs usage for one mount point, in bytes"""
+    st = os.statvfs(mount)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    # Same percentage df reports: used over space available to unprivileged users
+    usable = used + free
+    return {
+        "mount": mount,
+        "total": total,
+        "used": used,
+        "free": free,
+        "used_percent": round(used / usable * 100, 1) if usable else 0.0,
+        "unit": "bytes"
+    }
+
+def collect(mounts=("/",)):
+    """All system metrics as numbers with their units alongside"""
+    meminfo = read_meminfo()
+    mem_total = meminfo.get("MemTotal", 0) / 1024
+    mem_available = meminfo.get("MemAvailable", 0) / 1024
+    load_1, load_5, load_15 = read_loadavg()
+
+    disks = []
+    for mount in mounts:
+        try:
+            disks.append(disk_usage(mount))
+        except OSError as e:
+            disks.append({"mount": mount, "error": str(e)})
+
+    return {
+        "memory": {
+            "total": round(mem_total, 1),
+            "available": round(mem_available, 1),
+            "used_percent": round((mem_total - mem_available) / mem_total * 100, 1) if mem_total else 0.0,
+            "swap_total": round(meminfo.get("SwapTotal", 0) / 1024, 1),
+            "swap_free": round(meminfo.get("SwapFree", 0) / 1024, 1),
+            "unit": "MB"
+        },
+        "cpu": {"percent": round(cpu_percent(), 1), "unit": "%"},
+        "load": {"1m": load_1, "5m": load_5, "15m": load_15},
+        "uptime_seconds": round(read_uptime(), 1),
+        "disks": disks
+    }
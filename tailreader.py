@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Incremental Workspace Readers
+Follow growing memory logs by offset and index MEMORY.md sections only when it changes
+"""
+
+import os
+import threading
+from collections import deque
+from pathlib import Path
+
+TAIL_BYTES = 64 * 1024  # how far back a newly opened file is read to find its last lines
+FINGERPRINT_BYTES = 64  # bytes re-checked before the saved offset to detect rewrites
+
+class TailReader:
+    """Keeps the last lines of an append-only file, parsing only newly appended bytes
+
+    Switching to another path (day rollover), a new inode (file replaced), a file shorter
+    than the saved offset (truncation) or changed bytes before the offset (rewritten in
+    place) starts over from the file's tail.
+    """
+
+    def __init__(self, max_lines=20):
+        self.max_lines = max_lines
+        self._lock = threading.Lock()
+        self._reset(None, None)
+
+    def _reset(self, path, inode):
+        self.path = path
+        self.inode = inode
+        self.offset = 0
+        self.lines = deque(maxlen=self.max_lines)
+        self.partial = b""
+        self.fingerprint = b""
+
+    def _unchanged(self, f):
+        """Whether the bytes just before our offset are still the ones we read (catches rewrites in place)"""
+        if not self.fingerprint:
+            return True
+        f.seek(self.offset - len(self.fingerprint))
+        return f.read(len(self.fingerprint)) == self.fingerprint
+
+    def tail(self, path, count=None):
+        """Last `count` lines of path, as str.split('\\n') would give them; [] if missing"""
+        path = Path(path)
+        with self._lock:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._reset(None, None)
+                return []
+
+            with open(path, 'rb') as f:
+                if (path != self.path or st.st_ino != self.inode or st.st_size < self.offset
+                        or not self._unchanged(f)):
+                    self._reset(path, st.st_ino)
+                    self.offset = max(st.st_size - TAIL_BYTES, 0)
+                    skip_partial = self.offset > 0
+                else:
+                    skip_partial = False
+
+                if st.st_size <= self.offset:
+                    data = b""
+                else:
+                    f.seek(self.offset)
+                    data = f.read(st.st_size - self.offset)
+                    self.offset += len(data)
+                    self.fingerprint = (self.fingerprint + data)[-FINGERPRINT_BYTES:]
+
+            if data:
+                complete = (self.partial + data).split(b"\n")
+                self.partial = complete.pop()
+                if skip_partial and complete:
+                    # Started mid-file: the first line is only a fragment
+                    complete.pop(0)
+                self.lines.extend(line.decode('utf-8', 'replace') for line in complete)
+
+            lines = list(self.lines) + [self.partial.decode('utf-8', 'replace')]
+            return lines[-(count or self.max_lines):]
+
+class SectionIndex:
+    """Offsets of the '##' sections of a markdown file, rebuilt only when its mtime or size changes"""
+
+    def __init__(self, marker='##'):
+        self.marker = marker
+        self._lock = threading.Lock()
+        self.path = None
+        self.stamp = None
+        self.content = ""
+        self.offsets = []
+
+    def _refresh(self, path):
+        path = Path(path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.path, self.stamp, self.content, self.offsets = path, None, "", []
+            return False
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if path != self.path or stamp != self.stamp:
+            with open(path, 'r') as f:
+                self.content = f.read()
+            self.offsets = []
+            position = self.content.find(self.marker)
+            while position != -1:
+                self.offsets.append(position)
+                position = self.content.find(self.marker, position + len(self.marker))
+            self.path, self.stamp = path, stamp
+        return True
+
+    def headings(self, path):
+        """First line of every section"""
+        with self._lock:
+            if not self._refresh(path):
+                return []
+            return [self.content[offset + len(self.marker):].split('\n', 1)[0].strip(' #')
+                    for offset in self.offsets]
+
+    def last_section(self, path):
+        """Text after the final marker (the whole file if it has none), or None if missing"""
+        with self._lock:
+            if not self._refresh(path):
+                return None
+            if not self.offsets:
+                return self.content
+            return self.content[self.offsets[-1] + len(self.marker):]
+
+# Shared by every collector that reads these files
+daily_log = TailReader(max_lines=20)
+memory_index = SectionIndex()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Snapshot Views
+Every endpoint is a projection of the one canonical snapshot - encoded once per version of the sections it reads
+"""
+
+import apicodec
+
+class View:
+    """The sections one endpoint needs and how to shape them"""
+
+    def __init__(self, name, sections, project):
+        self.name = name
+        self.sections = tuple(sections)
+        self.project = project
+
+    def render(self, collector, ensure=True):
+        """(version, encoded body) - version only moves when one of this view's sections changes
+
+        ensure=False renders whatever the snapshot holds (stream pushes after a refresh).
+        """
+        if ensure:
+            collector.ensure(self.sections)
+        snapshot, versions = collector.snapshot_versions()
+        version = max((versions.get(section, 0) for section in self.sections), default=0)
+        return version, apicodec.cache.get((self.name, version), lambda: apicodec.dumps(self.project(snapshot)))
+
+class SnapshotView:
+    """The whole snapshot, served from the collector's own pre-composed bytes"""
+
+    name = "status"
+    sections = None
+
+    def render(self, collector, ensure=True):
+        if ensure:
+            collector.ensure()
+        return collector.versioned_bytes()
+
+def legacy_system(snapshot):
+    """Convert comprehensive data to the legacy /api/system shape"""
+    return {
+        "memory": snapshot.get("system", {}).get("memory_available", "Unknown"),
+        "storage": snapshot.get("system", {}).get("disk_free", "Unknown"),
+        "activities": [{"time": item["time"], "text": item["action"]}
+                       for item in snapshot.get("autonomous_work", [])[:5] if "action" in item],
+        "projects": snapshot.get("projects", [])
+    }
+
+# View name -> projection; /api/status and /api/system (and their stream views) render these
+VIEWS = {
+    "status": SnapshotView(),
+    "system": View("system", ["system", "projects", "autonomous_work"], legacy_system)
+}
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+🔥 Digiclaw Workspace Watcher
+Keeps workspace file sets and counts current from inotify events, polling where inotify is unavailable
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT = struct.Struct("iIII")
+
+POLL_INTERVAL = 5     # seconds between rescans in polling mode (and retries for a missing workspace)
+MAX_CHANGES = 100
+
+class Inotify:
+    """Minimal ctypes binding to the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask=WATCH_MASK):
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return wd
+
+    def rm_watch(self, wd):
+        self._rm(self.fd, wd)
+
+    def read(self, timeout):
+        """[(wd, mask, name)] - empty if nothing arrived within timeout"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT.size <= len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b"\0")
+            events.append((wd, mask, os.fsdecode(name)))
+            offset += EVENT.size + length
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+class WorkspaceWatcher:
+    """In-memory index of the workspace's top-level names and one subtree's entries
+
+    file_sets maps a name to glob patterns matched against top-level entries; tree is a
+    directory (relative to root) whose recursive entry count is maintained.
+    """
+
+    def __init__(self, root, file_sets, tree=None, poll_interval=POLL_INTERVAL):
+        self.root = Path(root)
+        self.file_sets = file_sets
+        self.tree = self.root / tree if tree else None
+        self.poll_interval = poll_interval
+        self.backend = None
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._top = set()
+        self._entries = {}   # directory path under tree -> set of names
+        self._mtimes = {}    # polling mode: path -> mtime, to spot modifications
+        self._changes = deque(maxlen=MAX_CHANGES)
+        self._inotify = None
+        self._wds = {}
+        self._scanned = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Queries ----------------------------------------------------------
+
+    def ready(self):
+        return self.backend is not None
+
+    def files(self, name):
+        """Top-level entries matching the named file set, pattern by pattern as chained globs list them"""
+        with self._lock:
+            return [entry for pattern in self.file_sets[name]
+                    for entry in sorted(fnmatch.filter(self._top, pattern))]
+
+    def tree_exists(self):
+        with self._lock:
+            return self.tree is not None and str(self.tree) in self._entries
+
+    def tree_count(self):
+        """Entries under tree, as len(list(tree.rglob('*'))) would count them"""
+        with self._lock:
+            return sum(len(names) for names in self._entries.values())
+
+    def changes(self, limit=20):
+        with self._lock:
+            return list(self._changes)[-limit:]
+
+    def add_listener(self, listener):
+        """Call listener(changes) with each batch of change events"""
+        self.listeners.append(listener)
+
+    # --- Lifecycle --------------------------------------------------------
+
+    def start(self, use_inotify=True):
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable ({e}) - polling workspace every {self.poll_interval}s")
+        self.backend = "inotify" if self._inotify else "polling"
+        self._rescan()
+        self._thread = threading.Thread(target=self._run, name="workspace-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._inotify:
+            self._inotify.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify:
+                try:
+                    events = self._inotify.read(self.poll_interval)
+                except OSError as e:
+                    print(f"inotify read failed: {e}")
+                    events = []
+                if events:
+                    self._apply(events)
+                elif self._unwatched():
+                    self._rescan()
+            else:
+                self._stop.wait(self.poll_interval)
+                self._rescan()
+
+    def _unwatched(self):
+        """Workspace or tree appeared since the last scan but has no watch yet"""
+        with self._lock:
+            watched = set(self._wds.values())
+        if self.root not in watched and self.root.is_dir():
+            return True
+        return self.tree is not None and self.tree not in watched and self.tree.is_dir()
+
+    # --- Index maintenance ------------------------------------------------
+
+    def _rescan(self):
+        """Rebuild the whole index from disk, reporting differences as changes"""
+        top = set()
+        entries = {}
+        mtimes = {}
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    top.add(entry.name)
+                    if not self._inotify and not entry.is_dir(follow_symlinks=False):
+                        mtimes[entry.path] = _mtime(entry)
+        except OSError:
+            pass
+        if self.tree is not None and self.tree.is_dir():
+            self._scan_tree(self.tree, entries, mtimes)
+
+        with self._lock:
+            changes = []
+            if self._scanned:
+                old_paths = {str(self.root / name) for name in self._top} | _tree_paths(self._entries)
+                new_paths = {str(self.root / name) for name in top} | _tree_paths(entries)
+                changes += [self._change(path, "created") for path in sorted(new_paths - old_paths)]
+                changes += [self._change(path, "deleted") for path in sorted(old_paths - new_paths)]
+                changes += [self._change(path, "modified") for path, mtime in mtimes.items()
+                            if path in self._mtimes and self._mtimes[path] != mtime]
+            self._top = top
+            self._entries = entries
+            self._mtimes = mtimes
+            self._scanned = True
+            if self._inotify:
+                self._rewatch()
+        self._notify(changes)
+
+    def _scan_tree(self, directory, entries, mtimes, watch=False):
+        """Index directory recursively; with watch, each directory is watched before it is listed
+        so entries created mid-scan still arrive as events"""
+        if watch:
+            self._watch(directory)
+        names = set()
+        entries[str(directory)] = names
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    names.add(entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        self._scan_tree(Path(entry.path), entries, mtimes, watch)
+                    elif not self._inotify:
+                        mtimes[entry.path] = _mtime(entry)
+        except OSError:
+            pass
+
+    def _rewatch(self):
+        for wd in list(self._wds):
+            self._inotify.rm_watch(wd)
+        self._wds = {}
+        for directory in [self.root] + [Path(path) for path in self._entries]:
+            self._watch(directory)
+
+    def _watch(self, directory):
+        try:
+            self._wds[self._inotify.add_watch(directory)] = Path(directory)
+        except OSError:
+            pass
+
+    def _forget(self, path):
+        """Drop a removed or moved-away directory and everything indexed below it"""
+        gone = {str(path)} | set(_tree_paths_under(self._entries, path))
+        for sub in gone:
+            self._entries.pop(sub, None)
+        for wd, directory in list(self._wds.items()):
+            if str(directory) in gone:
+                self._inotify.rm_watch(wd)
+                del self._wds[wd]
+
+    def _apply(self, events):
+        changes = []
+        rescan = False
+        with self._lock:
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                directory = self._wds.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._wds[wd]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    if directory in (self.root, self.tree):
+                        rescan = True
+                    continue
+
+                path = directory / name
+                key = str(directory)
+                is_dir = bool(mask & IN_ISDIR)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    if directory == self.root:
+                        self._top.add(name)
+                    if key in self._entries:
+                        self._entries[key].add(name)
+                    if is_dir and (key in self._entries or path == self.tree):
+                        self._scan_tree(path, self._entries, {}, watch=True)
+                    changes.append(self._change(path, "created"))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    if directory == self.root:
+                        self._top.discard(name)
+                    if key in self._entries:
+                        self._entries[key].discard(name)
+                    if is_dir:
+                        self._forget(path)
+                    changes.append(self._change(path, "deleted"))
+                elif mask & IN_CLOSE_WRITE:
+                    relative = self._relative(path)
+                    if not any(c["path"] == relative and c["change"] == "created" for c in changes):
+                        changes.append(self._change(path, "modified"))
+        if rescan:
+            self._rescan()
+        self._notify(changes)
+
+    def _relative(self, path):
+        try:
+            return str(Path(path).relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def _change(self, path, kind):
+        change = {"time": datetime.now().isoformat(timespec="seconds"), "path": self._relative(path), "change": kind}
+        self._changes.append(change)
+        return change
+
+    def _notify(self, changes):
+        if not changes:
+            return
+        for listener in self.listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                print(f"Workspace listener failed: {e}")
+
+def _mtime(entry):
+    try:
+        return entry.stat(follow_symlinks=False).st_mtime_ns
+    except OSError:
+        return None
+
+def _tree_paths(entries):
+    return {os.path.join(directory, name) for directory, names in entries.items() for name in names}
+
+def _tree_paths_under(entries, path):
+    prefix = str(path) + os.sep
+    return [directory for directory in entries if directory.startswith(prefix)]
+
+# The running watcher, set by serve.py; collectors fall back to globbing without one
+current = None